@@ -0,0 +1,45 @@
+"""add_item_name_indexes
+
+Revision ID: 3c1d7e94a2b8
+Revises: 9872421cdfc0
+Create Date: 2026-10-16 11:27:54.306219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1d7e94a2b8'
+down_revision: Union[str, None] = '9872421cdfc0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Backs get_item_by_name_for_org: WHERE organization_id = ? AND lower(name) = ?
+    op.create_index(
+        'ix_items_org_lower_name',
+        'items',
+        ['organization_id', sa.text('lower(name)')],
+        unique=False
+    )
+    # Trigram GIN index so the item name search (ILIKE '%...%') can use an index.
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_items_name_trgm',
+        'items',
+        ['name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_items_name_trgm', table_name='items', postgresql_using='gin')
+    op.drop_index('ix_items_org_lower_name', table_name='items')
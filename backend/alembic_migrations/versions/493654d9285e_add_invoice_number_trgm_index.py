@@ -0,0 +1,39 @@
+"""add_invoice_number_trgm_index
+
+Revision ID: 493654d9285e
+Revises: f6922ae0fb23
+Create Date: 2026-10-16 09:12:41.502113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '493654d9285e'
+down_revision: Union[str, None] = 'f6922ae0fb23'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Trigram GIN index so the invoice number search (ILIKE '%...%') can use an index
+    # instead of scanning the whole invoices table.
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_invoices_invoice_number_trgm',
+        'invoices',
+        ['invoice_number'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'invoice_number': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_invoices_invoice_number_trgm', table_name='invoices', postgresql_using='gin')
+    # The pg_trgm extension is left installed; other indexes may depend on it.
@@ -0,0 +1,53 @@
+"""shrink_url_columns
+
+Revision ID: 5c2e8b7d1f93
+Revises: e4a17b93c5d2
+Create Date: 2026-10-16 15:52:40.318274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e8b7d1f93'
+down_revision: Union[str, None] = 'e4a17b93c5d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Both hold server-generated /static/uploads/... paths, well under 512 characters.
+    # Fails (and rolls back) if an existing value is longer; check with
+    # SELECT max(length(image_url)) FROM item_images; / max(length(logo_url)) FROM organizations;
+    op.alter_column(
+        'item_images', 'image_url',
+        type_=sa.String(512),
+        existing_type=sa.String(1024),
+        existing_nullable=False
+    )
+    op.alter_column(
+        'organizations', 'logo_url',
+        type_=sa.String(512),
+        existing_type=sa.String(1024),
+        existing_nullable=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        'organizations', 'logo_url',
+        type_=sa.String(1024),
+        existing_type=sa.String(512),
+        existing_nullable=True
+    )
+    op.alter_column(
+        'item_images', 'image_url',
+        type_=sa.String(1024),
+        existing_type=sa.String(512),
+        existing_nullable=False
+    )
@@ -0,0 +1,48 @@
+"""cascade_deletes_in_database
+
+Revision ID: 7e0b4c6a9d15
+Revises: d58e2b9a1f40
+Create Date: 2026-10-16 14:02:31.508733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e0b4c6a9d15'
+down_revision: Union[str, None] = 'd58e2b9a1f40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, referred table) for every ownership FK; the constraints were created
+# unnamed in the initial migration, so they carry PostgreSQL's default <table>_<column>_fkey names.
+_CASCADE_FKS = [
+    ('organizations', 'user_id', 'users'),
+    ('customers', 'organization_id', 'organizations'),
+    ('items', 'organization_id', 'organizations'),
+    ('item_images', 'item_id', 'items'),
+    ('invoices', 'customer_id', 'customers'),
+    ('invoices', 'organization_id', 'organizations'),
+    ('invoices', 'user_id', 'users'),
+    ('invoice_items', 'invoice_id', 'invoices'),
+]
+
+
+def _recreate_foreign_keys(ondelete: Union[str, None]) -> None:
+    for table, column, referred_table in _CASCADE_FKS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referred_table, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _recreate_foreign_keys('CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _recreate_foreign_keys(None)
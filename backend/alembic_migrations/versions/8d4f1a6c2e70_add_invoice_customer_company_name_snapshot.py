@@ -0,0 +1,33 @@
+"""add_invoice_customer_company_name_snapshot
+
+Revision ID: 8d4f1a6c2e70
+Revises: 5c2e8b7d1f93
+Create Date: 2026-10-16 16:08:27.551903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4f1a6c2e70'
+down_revision: Union[str, None] = '5c2e8b7d1f93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Denormalized customer name for invoice lists; the application keeps it in sync from here on
+    op.add_column('invoices', sa.Column('customer_company_name_snapshot', sa.String(length=255), nullable=True))
+    op.execute(
+        "UPDATE invoices SET customer_company_name_snapshot = customers.company_name "
+        "FROM customers WHERE customers.id = invoices.customer_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('invoices', 'customer_company_name_snapshot')
@@ -0,0 +1,38 @@
+"""add_invoice_list_index
+
+Revision ID: 9872421cdfc0
+Revises: 493654d9285e
+Create Date: 2026-10-16 10:41:03.918552
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9872421cdfc0'
+down_revision: Union[str, None] = '493654d9285e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Backs the invoice list: WHERE user_id = ? ORDER BY invoice_date DESC, invoice_number DESC
+    op.create_index(
+        'ix_invoices_user_date_number',
+        'invoices',
+        ['user_id', sa.text('invoice_date DESC'), sa.text('invoice_number DESC')],
+        unique=False,
+        postgresql_include=['status', 'customer_id']
+    )
+    # user_id leads the composite, so its single-column index is redundant
+    op.drop_index('ix_invoices_user_id', table_name='invoices')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_invoices_user_id', 'invoices', ['user_id'], unique=False)
+    op.drop_index('ix_invoices_user_date_number', table_name='invoices')
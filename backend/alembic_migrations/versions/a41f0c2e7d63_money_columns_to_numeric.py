@@ -0,0 +1,52 @@
+"""money_columns_to_numeric
+
+Revision ID: a41f0c2e7d63
+Revises: 3c1d7e94a2b8
+Create Date: 2026-10-16 13:05:12.774190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41f0c2e7d63'
+down_revision: Union[str, None] = '3c1d7e94a2b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, precision, scale)
+_MONEY_COLUMNS = [
+    ('invoices', 'subtotal_amount', 14, 2),
+    ('invoices', 'tax_amount', 14, 2),
+    ('invoices', 'discount_amount', 14, 2),
+    ('invoices', 'total_amount', 14, 2),
+    ('invoices', 'amount_paid', 14, 2),
+    ('invoice_items', 'price', 14, 4),
+    ('invoice_items', 'line_total', 14, 2),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Exact NUMERIC storage for money; existing float values are rounded to the column scale.
+    for table, column, precision, scale in _MONEY_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.Numeric(precision, scale),
+            existing_type=sa.Float(),
+            postgresql_using=f'round({column}::numeric, {scale})'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column, precision, scale in _MONEY_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.Float(),
+            existing_type=sa.Numeric(precision, scale),
+            postgresql_using=f'{column}::double precision'
+        )
@@ -0,0 +1,45 @@
+"""add_org_list_composite_indexes
+
+Revision ID: b2f9c4e81a37
+Revises: 7e0b4c6a9d15
+Create Date: 2026-10-16 14:21:09.337412
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2f9c4e81a37'
+down_revision: Union[str, None] = '7e0b4c6a9d15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_items_org_name', 'items', ['organization_id', 'name'], unique=False)
+    op.create_index('ix_customers_org_company_name', 'customers', ['organization_id', 'company_name'], unique=False)
+    op.create_index(
+        'ix_item_images_item_order',
+        'item_images',
+        ['item_id', 'order_index'],
+        unique=False,
+        postgresql_include=['image_url']
+    )
+    # Each of these columns now leads a composite index, so the single-column ones are redundant
+    op.drop_index('ix_items_organization_id', table_name='items')
+    op.drop_index('ix_customers_organization_id', table_name='customers')
+    op.drop_index('ix_item_images_item_id', table_name='item_images')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_item_images_item_id', 'item_images', ['item_id'], unique=False)
+    op.create_index('ix_customers_organization_id', 'customers', ['organization_id'], unique=False)
+    op.create_index('ix_items_organization_id', 'items', ['organization_id'], unique=False)
+    op.drop_index('ix_item_images_item_order', table_name='item_images')
+    op.drop_index('ix_customers_org_company_name', table_name='customers')
+    op.drop_index('ix_items_org_name', table_name='items')
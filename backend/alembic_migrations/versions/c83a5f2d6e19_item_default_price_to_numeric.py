@@ -0,0 +1,41 @@
+"""item_default_price_to_numeric
+
+Revision ID: c83a5f2d6e19
+Revises: b2f9c4e81a37
+Create Date: 2026-10-16 14:47:55.120468
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c83a5f2d6e19'
+down_revision: Union[str, None] = 'b2f9c4e81a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Same NUMERIC(14, 4) as invoice_items.price; existing float values are rounded to 4 places.
+    op.alter_column(
+        'items', 'default_price',
+        type_=sa.Numeric(14, 4),
+        existing_type=sa.Float(),
+        existing_nullable=True,
+        postgresql_using='round(default_price::numeric, 4)'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        'items', 'default_price',
+        type_=sa.Float(),
+        existing_type=sa.Numeric(14, 4),
+        existing_nullable=True,
+        postgresql_using='default_price::double precision'
+    )
@@ -0,0 +1,39 @@
+"""add_invoice_org_composite_indexes
+
+Revision ID: d58e2b9a1f40
+Revises: a41f0c2e7d63
+Create Date: 2026-10-16 13:38:47.215904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd58e2b9a1f40'
+down_revision: Union[str, None] = 'a41f0c2e7d63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Per-organization listings: WHERE organization_id = ? [AND status = ?] ORDER BY invoice_date DESC
+    op.create_index(
+        'ix_invoices_org_status_date',
+        'invoices',
+        ['organization_id', 'status', sa.text('invoice_date DESC')],
+        unique=False
+    )
+    op.create_index('ix_invoices_org_customer', 'invoices', ['organization_id', 'customer_id'], unique=False)
+    # organization_id leads both composites, so its single-column index is redundant
+    op.drop_index('ix_invoices_organization_id', table_name='invoices')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_invoices_organization_id', 'invoices', ['organization_id'], unique=False)
+    op.drop_index('ix_invoices_org_customer', table_name='invoices')
+    op.drop_index('ix_invoices_org_status_date', table_name='invoices')
@@ -0,0 +1,38 @@
+"""add_customer_company_name_trgm_index
+
+Revision ID: e4a17b93c5d2
+Revises: c83a5f2d6e19
+Create Date: 2026-10-16 15:03:26.871942
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a17b93c5d2'
+down_revision: Union[str, None] = 'c83a5f2d6e19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Trigram GIN index so the company name search (ILIKE '%...%') and the
+    # case-insensitive name lookup can use an index.
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_customers_company_name_trgm',
+        'customers',
+        ['company_name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'company_name': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_customers_company_name_trgm', table_name='customers', postgresql_using='gin')
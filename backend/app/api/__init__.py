@@ -1 +1 @@
-from .api import api_router
\ No newline at end of file
+from .api import api_router, include_api_routers
\ No newline at end of file
@@ -1,4 +1,4 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, FastAPI
 
 # Import endpoint modules
 from app.api.endpoints import organizations # <--- IMPORT organizations ROUTER MODULE
@@ -10,19 +10,33 @@ from app.api.endpoints import invoices
 from app.api.endpoints import dashboard
 from app.api.endpoints import invoice_templates
 from app.api.endpoints import chat
+from app.api.deps import invoice_financials_cache_scope, user_cache_scope
 
-api_router = APIRouter()
+# (router, prefix, tags, dependencies). These are included straight into the app by
+# include_api_routers: every include_router copies the routes and rebuilds their dependency
+# graphs, so nesting them under api_router first would do that work twice at startup.
+# Authenticated routers get user_cache_scope, since their auth dependencies may look the same
+# user up several times per request.
+API_ROUTERS = (
+    (login.router, "/login", ["Login"], []),
+    (users.router, "/users", ["Users"], [Depends(user_cache_scope)]),
+    (organizations.router, "/organizations", ["Organizations"], [Depends(user_cache_scope)]),
+    (customers.router, "/customers", ["Customers"], [Depends(user_cache_scope)]),
+    (items.router, "/items", ["Items"], [Depends(user_cache_scope)]),
+    (invoices.router, "/invoices", ["Invoices"], [Depends(user_cache_scope), Depends(invoice_financials_cache_scope)]),
+    (dashboard.router, "/dashboard", ["Dashboard"], [Depends(user_cache_scope)]),
+    (invoice_templates.router, "/invoice-templates", ["Invoice Templates"], [Depends(user_cache_scope)]),
+    (chat.router, "/chat", ["AI Chat"], [Depends(user_cache_scope), Depends(invoice_financials_cache_scope)]),
+)
+
+api_router = APIRouter() # Routes defined directly on the API root
+
+def include_api_routers(app: FastAPI, prefix: str) -> None:
+    """Mounts every endpoint router, plus api_router's own routes, under `prefix`."""
+    for router, router_prefix, tags, dependencies in API_ROUTERS:
+        app.include_router(router, prefix=prefix + router_prefix, tags=tags, dependencies=dependencies)
+    app.include_router(api_router, prefix=prefix)
 
-# Include other routers here
-api_router.include_router(login.router, prefix="/login", tags=["Login"]) 
-api_router.include_router(users.router, prefix="/users", tags=["Users"]) 
-api_router.include_router(organizations.router, prefix="/organizations", tags=["Organizations"]) # <--- INCLUDE ROUTER
-api_router.include_router(customers.router, prefix="/customers", tags=["Customers"]) 
-api_router.include_router(items.router, prefix="/items", tags=["Items"])
-api_router.include_router(invoices.router, prefix="/invoices", tags=["Invoices"])
-api_router.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])
-api_router.include_router(invoice_templates.router, prefix="/invoice-templates", tags=["Invoice Templates"])
-api_router.include_router(chat.router, prefix="/chat", tags=["AI Chat"])
 @api_router.get("/test", tags=["Test"]) # This was our initial test endpoint
 async def test_endpoint():
     return {"message": "API router is working!"}
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import Generator, Optional # Optional might be useful for other deps later
+from typing import AsyncGenerator, Generator, Optional # Optional might be useful for other deps later
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -55,6 +55,26 @@ async def get_current_active_user(
 
 # We can add get_current_active_superuser dependency later if needed for admin actions
 
+async def invoice_financials_cache_scope() -> AsyncGenerator[None, None]:
+    """
+    Dependency that scopes the invoice financials memo to a single request.
+    """
+    crud.invoice.reset_invoice_financials_cache()
+    try:
+        yield
+    finally:
+        crud.invoice.clear_invoice_financials_cache()
+
+async def user_cache_scope() -> AsyncGenerator[None, None]:
+    """
+    Dependency that scopes the user lookup memo to a single request.
+    """
+    crud.user.reset_user_cache()
+    try:
+        yield
+    finally:
+        crud.user.clear_user_cache()
+
 # --- NEW DEPENDENCY FUNCTION ---
 async def get_valid_organization_for_user(
     org_id: uuid.UUID, # Path parameter from the endpoint
@@ -1,7 +1,8 @@
 # backend/app/api/endpoints/customers.py
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Any 
+from typing import List, Any, Optional
 import uuid
 
 from app import crud, models, schemas
@@ -10,6 +11,9 @@ from app.api import deps
 
 router = APIRouter()
 
+# Columns the customer list returns, read off the ORM rows directly (see read_customers_for_organization)
+_CUSTOMER_SUMMARY_FIELDS = tuple(schemas.CustomerSummary.model_fields)
+
 @router.post("/", response_model=schemas.Customer, status_code=status.HTTP_201_CREATED)
 async def create_new_customer(
     *,
@@ -41,6 +45,7 @@ async def read_customers_for_organization(
     *,
     db: AsyncSession = Depends(get_db),
     organization_id: uuid.UUID = Query(..., description="The ID of the organization to fetch customers for"),
+    search: Optional[str] = Query(None, description="Search term to filter customers by company name"),
     skip: int = 0,
     limit: int = 100,
     current_user: models.User = Depends(deps.get_current_active_user)
@@ -53,9 +58,13 @@ async def read_customers_for_organization(
     )
 
     customers = await crud.customer.get_customers_by_organization(
-        db, organization_id=organization.id, skip=skip, limit=limit
+        db, organization_id=organization.id, skip=skip, limit=limit, search=search
     )
-    return customers
+    # Trusted DB values go straight to orjson rather than being re-validated against response_model
+    return ORJSONResponse([
+        {field: getattr(customer, field) for field in _CUSTOMER_SUMMARY_FIELDS}
+        for customer in customers
+    ])
 
 @router.get("/{customer_id}", response_model=schemas.Customer)
 async def read_customer_by_id(
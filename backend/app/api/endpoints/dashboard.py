@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 import uuid
@@ -13,6 +13,7 @@ router = APIRouter()
 @router.get("/stats", response_model=schemas.DashboardStats)
 async def get_user_dashboard_stats(
     *,
+    request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
     # Use Depends for query parameters to leverage Pydantic validation from DashboardFilters
@@ -24,6 +25,7 @@ async def get_user_dashboard_stats(
     """
     Retrieve dashboard statistics for the authenticated user.
     Stats can be filtered by organization_id and date range.
+    Responses carry an ETag; a matching If-None-Match gets a 304 with no body.
     """
     # The 'filters' object now contains organization_id, date_from, date_to
     # as validated by Pydantic.
@@ -36,11 +38,15 @@ async def get_user_dashboard_stats(
          if not org or org.user_id != current_user.id:
              raise HTTPException(status_code=403, detail="Not authorized for this organization's stats")
 
-    stats_data = await crud.dashboard.get_dashboard_stats(
+    # The body is cached already encoded (and validated against DashboardStats), so it is sent as-is
+    body, etag = await crud.dashboard.get_dashboard_stats_response(
         db,
         user_id=current_user.id,
         organization_id=filters.organization_id,
         date_from=filters.date_from,
         date_to=filters.date_to
     )
-    return stats_data # Pydantic will validate this dict against DashboardStats schema
\ No newline at end of file
+    headers = {"etag": etag, "cache-control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
@@ -1,5 +1,5 @@
 # backend/app/api/endpoints/invoice_templates.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Any
 import uuid
@@ -50,11 +50,11 @@ async def read_all_invoice_templates(
     Retrieve all invoice templates.
     """
     templates = await crud.invoice_template.get_all_invoice_templates(db, skip=skip, limit=limit)
-    # Convert to summary schema if needed, or ensure InvoiceTemplate can be directly used.
-    # For consistency with other list endpoints, returning summary is good practice.
-    return [
-        schemas.InvoiceTemplateSummary.model_validate(template) for template in templates
-    ]
+    # Returned as summaries for consistency with other list endpoints. The page is validated and
+    # encoded to JSON bytes in one pass, so response_model only documents the shape.
+    adapter = schemas.InvoiceTemplateSummaryListAdapter
+    summaries = adapter.validate_python(templates, from_attributes=True)
+    return Response(adapter.dump_json(summaries), media_type="application/json")
 
 
 @router.get("/{template_id}", response_model=schemas.InvoiceTemplate)
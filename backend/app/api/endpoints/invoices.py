@@ -1,5 +1,6 @@
 # backend/app/api/endpoints/invoices.py
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.responses import ORJSONResponse
 import asyncio 
 from concurrent.futures import ThreadPoolExecutor 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -95,22 +96,23 @@ async def read_invoices_for_user(
         limit=limit
     )
     
-    summaries = []
-    for inv in invoices:
-        customer_name = inv.customer.company_name if inv.customer else None
-        summaries.append(
-            schemas.InvoiceSummary(
-                id=inv.id,
-                invoice_number=inv.invoice_number,
-                invoice_date=inv.invoice_date,
-                customer_company_name=customer_name,
-                total_amount=inv.total_amount,
-                currency=inv.currency,
-                status=inv.status,
-                invoice_type=inv.invoice_type
-            )
-        )
-    return summaries
+    # Rows come straight from the DB, so they are handed to orjson as plain dicts (UUIDs, dates and
+    # enums encode natively) instead of being built into InvoiceSummary models and re-validated
+    # against response_model. response_model still documents the shape.
+    summaries = [
+        {
+            "id": inv.id,
+            "invoice_number": inv.invoice_number,
+            "invoice_date": inv.invoice_date,
+            "customer_company_name": inv.customer_company_name_snapshot,
+            "total_amount": inv.total_amount,
+            "currency": inv.currency,
+            "status": inv.status,
+            "invoice_type": inv.invoice_type,
+        }
+        for inv in invoices
+    ]
+    return ORJSONResponse(summaries)
 
 
 @router.get("/{invoice_id}", response_model=schemas.Invoice)
@@ -227,13 +229,8 @@ async def download_invoice_pdf(
     # --- START: Determine Template Path ---
     template_file_name_to_use: Optional[str] = None
 
-    # The invoice.organization should have selected_invoice_template eagerly loaded
-    # due to lazy="selectin" in Organization model and get_invoice in crud.invoice
-    # However, let's explicitly refresh if needed or access it safely.
-    
-    # It's good practice to ensure relationships are loaded if you depend on them.
-    # The get_invoice in crud.invoice already does joinedload(InvoiceModel.organization)
-    # which *should* bring selected_invoice_template if the relationship is set up for eager loading.
+    # get_invoice joinedloads invoice.organization and its selected_invoice_template
+    # (the relationship is lazy="raise_on_sql" otherwise).
     # If invoice.organization.selected_invoice_template is None after get_invoice, it means no template is selected.
 
     if invoice.organization and invoice.organization.selected_invoice_template:
@@ -1,5 +1,6 @@
 # backend/app/api/endpoints/items.py
 from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Any, Optional
 import uuid
@@ -26,8 +27,7 @@ async def create_new_item(
     await deps.get_valid_organization_for_user(
         db=db, org_id=item_in.organization_id, current_user=current_user
     )
-    existing_item = await crud.item.get_item_by_name_for_org(db, name=item_in.name, organization_id=item_in.organization_id)
-    if existing_item:
+    if await crud.item.item_name_exists_for_org(db, name=item_in.name, organization_id=item_in.organization_id):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="An item with this name already exists in this organization.")
     item = await crud.item.create_item(db=db, item_in=item_in)
     return item
@@ -44,30 +44,14 @@ async def read_items_for_organization(
     await deps.get_valid_organization_for_user(
         db=db, org_id=organization_id, current_user=current_user
     )
-    items_from_db = await crud.item.get_items_by_organization(
+    item_rows = await crud.item.get_item_summaries_by_organization(
         db, organization_id=organization_id, search=search, skip=skip, limit=limit
     )
-    item_summaries = []
-    for item_model in items_from_db:
-        primary_img_url = None
-        # Ensure images are sorted by order_index if you want the first to be specific
-        # The relationship in Item model already has order_by="ItemImage.order_index"
-        if item_model.images and len(item_model.images) > 0: 
-            primary_img_url = item_model.images[0].image_url
-        
-        item_summaries.append(
-            schemas.ItemSummary(
-                id=item_model.id,
-                name=item_model.name,
-                description=item_model.description, # <-- ENSURE THIS IS PASSED
-                default_price=item_model.default_price,
-                default_unit=item_model.default_unit,
-                primary_image_url=primary_img_url
-            )
-        )
-    return item_summaries
+    # Rows already carry exactly the ItemSummary fields, including primary_image_url, so they go
+    # straight to orjson rather than through ItemSummary and a second pass against response_model
+    return ORJSONResponse([row._asdict() for row in item_rows])
 
-@router.get("/{item_id}", response_model=schemas.Item)
+@router.get("/{item_id}", response_model=schemas.ItemDetail)
 async def read_item_by_id(
     item_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
@@ -79,7 +63,8 @@ async def read_item_by_id(
     await deps.get_valid_organization_for_user(
         db=db, org_id=item.organization_id, current_user=current_user
     )
-    return item
+    # Built from the loaded row without validation and encoded by orjson; response_model documents the shape
+    return ORJSONResponse(schemas.ItemDetail.from_row(item).model_dump())
 
 @router.put("/{item_id}", response_model=schemas.Item)
 async def update_existing_item(
@@ -94,13 +79,11 @@ async def update_existing_item(
     await deps.get_valid_organization_for_user(
         db=db, org_id=db_item.organization_id, current_user=current_user
     )
-    if item_in.name is not None and item_in.name != db_item.name:
-         existing_item_with_new_name = await crud.item.get_item_by_name_for_org(
-             db, name=item_in.name, organization_id=db_item.organization_id
-         )
-         if existing_item_with_new_name and existing_item_with_new_name.id != item_id:
-             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Another item with this name already exists in this organization.")
-    item = await crud.item.update_item(db=db, db_obj=db_item, obj_in=item_in)
+    try:
+        # update_item checks for a duplicate name within the same UPDATE statement
+        item = await crud.item.update_item(db=db, db_obj=db_item, obj_in=item_in)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Another item with this name already exists in this organization.")
     return item
 
 @router.delete("/{item_id}", response_model=schemas.Item) 
@@ -128,7 +111,7 @@ async def delete_existing_item(
     deleted_item_data = await crud.item.delete_item(db=db, db_obj=db_item)
     return deleted_item_data
 
-@router.post("/{item_id}/images", response_model=schemas.Item, status_code=status.HTTP_201_CREATED)
+@router.post("/{item_id}/images", response_model=schemas.ItemDetail, status_code=status.HTTP_201_CREATED)
 async def upload_item_images_endpoint(
     item_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
@@ -144,13 +127,9 @@ async def upload_item_images_endpoint(
     item_specific_image_storage_path = STATIC_UPLOADS_DIR_ITEMS / ITEM_IMAGES_SUBDIR / str(item_id)
     item_specific_image_storage_path.mkdir(parents=True, exist_ok=True)
     
-    # Determine the starting order_index for new images
-    # The relationship `ItemModel.images` is already ordered by `order_index` due to `lazy="selectin"` and `order_by`
-    next_order_index = 0
-    if db_item.images and len(db_item.images) > 0:
-        next_order_index = db_item.images[-1].order_index + 1
-
-
+    # Files are written first and their rows inserted in one batch afterwards;
+    # add_images_to_item appends them after the item's current highest order_index.
+    saved_images = [] # (path on disk, url for db, alt text)
     for file_upload in files:
         allowed_mime_types = ["image/jpeg", "image/png", "image/gif", "image/webp", "image/svg+xml"]
         if file_upload.content_type not in allowed_mime_types:
@@ -167,18 +146,11 @@ async def upload_item_images_endpoint(
                 shutil.copyfileobj(file_upload.file, file_object)
                 
             image_url_for_db = f"/static/uploads/{ITEM_IMAGES_SUBDIR}/{item_id}/{unique_filename_for_disk}"
-            
-            await crud.item.add_image_to_item(
-                db=db, 
-                item_id=item_id, 
-                image_url=image_url_for_db, 
-                order_index=next_order_index, # Pass the calculated order_index
-                alt_text=Path(file_upload.filename if file_upload.filename else "item image").stem
-            )
-            next_order_index += 1
+            alt_text = Path(file_upload.filename if file_upload.filename else "item image").stem
+            saved_images.append((file_location_on_server, image_url_for_db, alt_text))
         except Exception as e:
             print(f"Error processing image file {file_upload.filename}: {e}")
-            # Consider removing the saved file if DB entry fails
+            # Remove the partially saved file
             if 'file_location_on_server' in locals() and file_location_on_server.exists():
                 try:
                     file_location_on_server.unlink()
@@ -186,14 +158,27 @@ async def upload_item_images_endpoint(
                     print(f"Error cleaning up partially saved file {file_location_on_server}: {e_del_file}")
         finally:
             file_upload.file.close()
+
+    if saved_images:
+        try:
+            await crud.item.add_images_to_item(
+                db=db, item_id=item_id, images=[(url, alt) for _, url, alt in saved_images]
+            )
+        except Exception as e:
+            print(f"Error saving image records for item {item_id}: {e}")
+            await db.rollback()
+            # None of the rows were written, so none of the files are referenced
+            for file_location_on_server, _, _ in saved_images:
+                try:
+                    file_location_on_server.unlink()
+                except Exception as e_del_file:
+                    print(f"Error cleaning up saved file {file_location_on_server}: {e_del_file}")
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to save item images.")
             
-    # Re-fetch the item to ensure the response includes all images (old and newly added)
-    # and they are correctly ordered
-    updated_item_with_images = await crud.item.get_item(db, item_id=item_id)
-    if not updated_item_with_images:
-         # This should ideally not happen if the item existed.
-         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to retrieve item after image uploads.")
-    return updated_item_with_images
+    # Reload the images collection so the response includes old and newly added images in order
+    # (get_item would return the identity-mapped item with its already-loaded collection).
+    await db.refresh(db_item, attribute_names=["images"])
+    return db_item
 
 @router.delete("/images/{image_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_single_item_image(
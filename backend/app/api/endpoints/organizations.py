@@ -1,5 +1,6 @@
 # backend/app/api/endpoints/organizations.py
 from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Any # Any is used in return type hints
 import uuid
@@ -19,6 +20,9 @@ ORG_LOGO_SUBDIR = "org_logos"
 
 router = APIRouter()
 
+# Columns the organization list returns, read off the ORM rows directly (see read_organizations_for_user)
+_ORGANIZATION_SUMMARY_FIELDS = tuple(schemas.OrganizationSummary.model_fields)
+
 @router.post("/", response_model=schemas.Organization, status_code=status.HTTP_201_CREATED)
 async def create_new_organization(
     *,
@@ -56,7 +60,11 @@ async def read_organizations_for_user(
     organizations = await crud.organization.get_organizations_by_user(
         db, user_id=current_user.id, skip=skip, limit=limit
     )
-    return organizations
+    # Trusted DB values go straight to orjson rather than being re-validated against response_model
+    return ORJSONResponse([
+        {field: getattr(organization, field) for field in _ORGANIZATION_SUMMARY_FIELDS}
+        for organization in organizations
+    ])
 
 @router.get("/{org_id}", response_model=schemas.Organization)
 async def read_organization_by_id(
@@ -70,7 +78,9 @@ async def read_organization_by_id(
     organization = await deps.get_valid_organization_for_user(
         db=db, org_id=org_id, current_user=current_user
     )
-    return organization
+    await crud.organization.load_selected_invoice_template(db, organization)
+    # Built from the loaded row without validation and encoded by orjson; response_model documents the shape
+    return ORJSONResponse(schemas.Organization.from_row(organization).model_dump())
 
 
 @router.put("/{org_id}", response_model=schemas.Organization)
@@ -103,6 +113,7 @@ async def delete_existing_organization(
     db_org = await deps.get_valid_organization_for_user(
         db=db, org_id=org_id, current_user=current_user
     )
+    await crud.organization.load_selected_invoice_template(db, db_org) # For the response, while the row still exists
 
     deleted_organization = await crud.organization.delete_organization(db=db, db_obj=db_org)
     if deleted_organization and deleted_organization.logo_url:
@@ -170,7 +181,7 @@ async def upload_organization_logo(
     logo_url_path_for_db = f"/static/uploads/{ORG_LOGO_SUBDIR}/{filename}"
     
     db_org.logo_url = logo_url_path_for_db
-    await db.commit()
-    await db.refresh(db_org)
-    
+    await db.flush() # Organizations have no server-side defaults to read back; get_db commits
+    await crud.organization.load_selected_invoice_template(db, db_org)
+
     return db_org
\ No newline at end of file
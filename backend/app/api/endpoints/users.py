@@ -1,5 +1,6 @@
 # backend/app/api/endpoints/users.py
 from fastapi import APIRouter, Depends, HTTPException, status, Response # Add Response for 204
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Any 
 import uuid
@@ -37,7 +38,8 @@ async def read_users_me(
     """
     Get current user.
     """
-    return current_user
+    # current_user was just loaded by the auth dependency, so it is trusted as-is
+    return ORJSONResponse(schemas.UserOut.from_row(current_user).model_dump())
 
 @router.put("/me", response_model=schemas.UserOut)
 async def update_user_me(
@@ -16,6 +16,15 @@ class Settings(BaseSettings):
     POSTGRES_DB: Optional[str] = "dads_invoice_db"
     POSTGRES_PORT: int = 5435
     DATABASE_URL: Optional[str] = None # Will be constructed
+    DATABASE_URL_SAFE: Optional[str] = None # DATABASE_URL with the password masked, for logs; constructed alongside it
+    DB_POOL_SIZE: int = 20 # Persistent connections kept in the pool
+    DB_MAX_OVERFLOW: int = 10 # Extra connections allowed under burst load
+    DB_POOL_TIMEOUT: int = 30 # Seconds to wait for a free connection before erroring
+    DB_POOL_RECYCLE: int = 1800 # Seconds before a connection is replaced
+    DB_POOL_WARM_CONNECTIONS: int = 5 # Connections opened at startup so the first requests skip connect/auth
+    DB_POOL_PRE_PING: bool = False # Ping on every checkout; pool_recycle already retires old connections
+    DB_QUERY_CACHE_SIZE: int = 1200 # SQLAlchemy compiled-SQL cache entries (default 500)
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500 # asyncpg prepared statements kept per connection (default 100)
 
     # Azure OpenAI
     AZURE_OPENAI_ENDPOINT: Optional[str] = None
@@ -64,8 +73,18 @@ if settings.POSTGRES_USER and settings.POSTGRES_PASSWORD and \
         f"postgresql+asyncpg://{settings.POSTGRES_USER}:{encoded_password}@" # <--- USE ENCODED PASSWORD
         f"{settings.POSTGRES_SERVER}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
     )
+    # Built from the parts rather than by searching the URL for the (encoded) password
+    settings.DATABASE_URL_SAFE = (
+        f"postgresql+asyncpg://{settings.POSTGRES_USER}:********@"
+        f"{settings.POSTGRES_SERVER}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
+    )
 else:
     print("Database URL could not be constructed. Check POSTGRES environment variables in .env and config defaults.")
+    if settings.DATABASE_URL: # Supplied directly via .env; mask whatever password it carries
+        _url = urllib.parse.urlsplit(settings.DATABASE_URL)
+        if _url.password:
+            _url = _url._replace(netloc=_url.netloc.replace(f":{_url.password}@", ":********@", 1))
+        settings.DATABASE_URL_SAFE = _url.geturl()
 
 
 # --- NEW: Validate Gemini API Key ---
@@ -0,0 +1,77 @@
+# backend/app/core/cors.py
+from typing import Iterable, List, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+_PREFLIGHT_MAX_AGE = b"86400" # Browsers cap this lower (Chrome: 2h), but it saves repeat preflights either way
+
+
+class FastCORS:
+    """
+    Credentialed CORS for a fixed list of origins, all methods and all request headers
+    (what CORSMiddleware was configured with here). Origins are matched as bytes against a
+    frozenset and every header value that doesn't depend on the request is built once.
+    Requests without an Origin header, or from an origin not in the list, pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, origins: Iterable[str]) -> None:
+        self.app = app
+        origin_set = {o.encode("latin-1") for o in origins}
+        self._allow_any_origin = b"*" in origin_set
+        self._ok_origins = frozenset(origin_set)
+        # With credentials the origin has to be echoed back rather than "*", so these go alongside it
+        self._simple_headers: List[Tuple[bytes, bytes]] = [
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+        ]
+        self._preflight_headers: List[Tuple[bytes, bytes]] = self._simple_headers + [
+            (b"access-control-allow-methods", _ALLOW_METHODS),
+            (b"access-control-max-age", _PREFLIGHT_MAX_AGE),
+            (b"content-type", b"text/plain; charset=utf-8"),
+            (b"content-length", b"2"),
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        is_preflight = False
+        requested_headers = b""
+        is_options = scope["method"] == "OPTIONS"
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+                if not is_options:
+                    break
+            elif is_options and name == b"access-control-request-method":
+                is_preflight = True
+            elif is_options and name == b"access-control-request-headers":
+                requested_headers = value
+
+        if origin is None or not (self._allow_any_origin or origin in self._ok_origins):
+            await self.app(scope, receive, send)
+            return
+
+        if is_preflight:
+            await self._preflight(origin, requested_headers, send)
+            return
+
+        cors_headers = [(b"access-control-allow-origin", origin)] + self._simple_headers
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", ())) + cors_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def _preflight(self, origin: bytes, requested_headers: bytes, send: Send) -> None:
+        headers = [(b"access-control-allow-origin", origin)] + self._preflight_headers
+        if requested_headers:
+            # "*" isn't honoured for credentialed requests, so echo back whatever was asked for
+            headers.append((b"access-control-allow-headers", requested_headers))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b"OK"})
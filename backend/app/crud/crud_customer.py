@@ -29,14 +29,17 @@ async def get_customer_by_company_name_for_org(
     return result.scalars().first()
 
 async def get_customers_by_organization(
-    db: AsyncSession, *, organization_id: uuid.UUID, skip: int = 0, limit: int = 100
+    db: AsyncSession, *, organization_id: uuid.UUID, skip: int = 0, limit: int = 100, search: Optional[str] = None
 ) -> list[CustomerModel]:
     """
     Get a list of customers for a specific organization with pagination.
+    Optionally filters by search term in company name (served by ix_customers_company_name_trgm).
     """
+    query = select(CustomerModel).filter(CustomerModel.organization_id == organization_id)
+    if search:
+        query = query.filter(CustomerModel.company_name.ilike(f"%{search}%"))
     result = await db.execute(
-        select(CustomerModel)
-        .filter(CustomerModel.organization_id == organization_id)
+        query
         .order_by(CustomerModel.company_name) # Optional: order by name
         .offset(skip)
         .limit(limit)
@@ -55,8 +58,7 @@ async def create_customer(
     db_obj = CustomerModel(**db_obj_data)
     
     db.add(db_obj)
-    await db.commit()
-    await db.refresh(db_obj)
+    await db.flush() # get_db commits once the request succeeds
     return db_obj
 
 async def update_customer(
@@ -85,9 +87,7 @@ async def update_customer(
     for field, value in update_data.items():
         setattr(db_obj, field, value)
     
-    db.add(db_obj)
-    await db.commit()
-    await db.refresh(db_obj)
+    await db.flush() # No refresh: customers have no server-side defaults to read back
     return db_obj
 
 async def delete_customer(db: AsyncSession, *, db_obj: CustomerModel) -> CustomerModel:
@@ -95,5 +95,5 @@ async def delete_customer(db: AsyncSession, *, db_obj: CustomerModel) -> Custome
     Delete a customer.
     """
     await db.delete(db_obj)
-    await db.commit()
+    await db.flush()
     return db_obj
\ No newline at end of file
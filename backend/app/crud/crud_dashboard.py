@@ -1,14 +1,25 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, event
+from sqlalchemy.orm import Session, ORMExecuteState, object_session
+import hashlib
+import orjson
 import uuid
 from datetime import date, datetime
-from typing import Optional
+from typing import Optional, Tuple
 
+from app.db.cache import ProcessCache, invalidate_on_commit
+from app.models.customer import Customer as CustomerModel
 from app.models.invoice import Invoice as InvoiceModel
+from app.models.organization import Organization as OrganizationModel
+from app.models.user import User as UserModel
+from app.schemas.dashboard import DashboardStats
 from app.schemas.invoice import InvoiceStatusEnum # For filtering by status
 # from app.models.organization import Organization as OrganizationModel # If fetching org currency
 
+# Invoices with money still owed
+_OPEN_STATUSES = (InvoiceStatusEnum.UNPAID, InvoiceStatusEnum.PARTIALLY_PAID, InvoiceStatusEnum.OVERDUE)
+
 async def get_dashboard_stats(
     db: AsyncSession,
     *,
@@ -33,94 +44,106 @@ async def get_dashboard_stats(
     if date_to:
         query_filters.append(InvoiceModel.invoice_date <= date_to)
 
-    # --- Total Invoiced Amount ---
-    # Sum total_amount of all non-cancelled, non-draft invoices (or all if preferred)
-    # For simplicity, let's sum all non-cancelled. Drafts might be excluded by some.
-    total_invoiced_query = select(func.sum(InvoiceModel.total_amount)).filter(
-        and_(*query_filters, InvoiceModel.status != InvoiceStatusEnum.CANCELLED)
-        # Optional: .filter(InvoiceModel.status != InvoiceStatusEnum.DRAFT)
-    )
-    total_invoiced_result = await db.execute(total_invoiced_query)
-    total_invoiced_amount = total_invoiced_result.scalar_one_or_none() or 0.0
-
-    # --- Total Collected Amount ---
-    # Sum amount_paid of 'Paid' and 'Partially Paid' invoices
-    # OR just sum amount_paid for all non-cancelled invoices
-    total_collected_query = select(func.sum(InvoiceModel.amount_paid)).filter(
-        and_(*query_filters, InvoiceModel.status != InvoiceStatusEnum.CANCELLED)
-    )
-    total_collected_result = await db.execute(total_collected_query)
-    total_collected_amount = total_collected_result.scalar_one_or_none() or 0.0
-
-    # --- Total Outstanding Amount ---
-    # This could be total_invoiced - total_collected
-    # Or, sum of (total_amount - amount_paid) for Unpaid, Partially Paid, Overdue
-    # total_outstanding_amount = total_invoiced_amount - total_collected_amount
-    # Let's do the sum for more precision if totals were ever manually overridden
-    outstanding_query = select(func.sum(InvoiceModel.total_amount - InvoiceModel.amount_paid)).filter(
-        and_(
-            *query_filters,
-            InvoiceModel.status.in_([
-                InvoiceStatusEnum.UNPAID,
-                InvoiceStatusEnum.PARTIALLY_PAID,
-                InvoiceStatusEnum.OVERDUE
-            ])
-        )
-    )
-    outstanding_result = await db.execute(outstanding_query)
-    total_outstanding_amount = outstanding_result.scalar_one_or_none() or 0.0
-
+    # All four figures come from one scan of the filtered invoices, each aggregate
+    # restricted with its own FILTER (WHERE ...) clause.
+    not_cancelled = InvoiceModel.status != InvoiceStatusEnum.CANCELLED
 
-    # --- Count of Overdue Invoices ---
     # Overdue status OR (Unpaid/Partially Paid AND due_date < today)
-    # For simplicity here, just count by status. A more robust check would use due_date.
-    # Make sure due_date is not None for overdue calculation if based on date.
     today = date.today()
-    overdue_count_query = select(func.count(InvoiceModel.id)).filter(
+    is_overdue = or_(
+        InvoiceModel.status == InvoiceStatusEnum.OVERDUE,
         and_(
-            *query_filters,
-            or_(
-                InvoiceModel.status == InvoiceStatusEnum.OVERDUE,
-                and_(
-                    InvoiceModel.status.in_([InvoiceStatusEnum.UNPAID, InvoiceStatusEnum.PARTIALLY_PAID]),
-                    InvoiceModel.due_date != None, # mypy/linter might need != None explicitly
-                    InvoiceModel.due_date < today 
-                )
-            )
+            InvoiceModel.status.in_([InvoiceStatusEnum.UNPAID, InvoiceStatusEnum.PARTIALLY_PAID]),
+            InvoiceModel.due_date != None, # mypy/linter might need != None explicitly
+            InvoiceModel.due_date < today 
         )
     )
-    overdue_count_result = await db.execute(overdue_count_query)
-    count_overdue_invoices = overdue_count_result.scalar_one() or 0
-
-    # Currency: For V1, if an organization is selected, we could try to fetch its default currency.
-    # If no org selected, or orgs have different currencies, this becomes complex.
-    # For now, let's return None, implying the frontend might need to specify or assume.
-    # Or, if all amounts are from a single currency DB column, we can fetch one invoice's currency.
-    default_currency = "USD" # Fallback
-    if organization_id:
-        # Fetch one invoice from this org to get its currency as representative
-        # This is a simplification. Ideally, Org model would have a default currency.
-        first_invoice_for_org_query = select(InvoiceModel.currency).filter(
-            InvoiceModel.organization_id == organization_id
-        ).limit(1)
-        currency_result = await db.execute(first_invoice_for_org_query)
-        org_currency = currency_result.scalar_one_or_none()
-        if org_currency:
-            default_currency = org_currency
-    elif user_id and not organization_id: # If no specific org, try to get from any user invoice
-        first_invoice_for_user_query = select(InvoiceModel.currency).filter(
-            InvoiceModel.user_id == user_id
-        ).limit(1)
-        currency_result = await db.execute(first_invoice_for_user_query)
-        user_currency = currency_result.scalar_one_or_none()
-        if user_currency:
-            default_currency = user_currency
 
+    # Currency: for V1, one of the organization's (or, with no org selected, the user's) invoices
+    # is taken as representative. This is a simplification; ideally Org would have a default currency.
+    # It ignores the date filters, and rides along in the same statement as an uncorrelated subquery.
+    currency_owner_filter = (
+        InvoiceModel.organization_id == organization_id if organization_id
+        else InvoiceModel.user_id == user_id
+    )
+    representative_currency = (
+        select(InvoiceModel.currency)
+        .filter(currency_owner_filter)
+        .limit(1)
+        .correlate(None)
+        .scalar_subquery()
+    )
+
+    stats_query = select(
+        # Sum total_amount of all non-cancelled invoices (drafts included)
+        func.coalesce(func.sum(InvoiceModel.total_amount).filter(not_cancelled), 0).label("total_invoiced_amount"),
+        # Sum amount_paid for all non-cancelled invoices
+        func.coalesce(func.sum(InvoiceModel.amount_paid).filter(not_cancelled), 0).label("total_collected_amount"),
+        # Sum of (total_amount - amount_paid) for Unpaid, Partially Paid, Overdue,
+        # for more precision than invoiced - collected if totals were ever manually overridden
+        func.coalesce(
+            func.sum(InvoiceModel.total_amount - InvoiceModel.amount_paid).filter(InvoiceModel.status.in_(_OPEN_STATUSES)), 0
+        ).label("total_outstanding_amount"),
+        func.count().filter(is_overdue).label("count_overdue_invoices"),
+        representative_currency.label("currency"),
+    ).filter(*query_filters)
+
+    stats = (await db.execute(stats_query)).one()
 
     return {
-        "total_invoiced_amount": round(total_invoiced_amount, 2),
-        "total_collected_amount": round(total_collected_amount, 2),
-        "total_outstanding_amount": round(total_outstanding_amount, 2),
-        "count_overdue_invoices": count_overdue_invoices,
-        "currency": default_currency # V1: simplified currency handling
-    }
\ No newline at end of file
+        "total_invoiced_amount": round(float(stats.total_invoiced_amount), 2),
+        "total_collected_amount": round(float(stats.total_collected_amount), 2),
+        "total_outstanding_amount": round(float(stats.total_outstanding_amount), 2),
+        "count_overdue_invoices": stats.count_overdue_invoices,
+        "currency": stats.currency or "USD" # V1: simplified currency handling, USD fallback
+    }
+
+
+# Process-wide cache of encoded DashboardStats bodies and their ETags, keyed by
+# (user_id, organization_id, date_from, date_to, today); today is part of the key because
+# the overdue count depends on it. Entries are kept for a minute and dropped when one of
+# the user's invoices is written, and again when that write commits or rolls back.
+_dashboard_cache = ProcessCache(maxsize=1024, ttl=60)
+
+def _discard_user_dashboards(user_id: uuid.UUID) -> None:
+    _dashboard_cache.discard_where(lambda key: key[0] == user_id)
+
+def _invalidate_user_dashboards(_mapper, _connection, target: InvoiceModel) -> None:
+    invalidate_on_commit(object_session(target), _discard_user_dashboards, target.user_id)
+
+def _clear_dashboard_cache(_mapper, _connection, target) -> None:
+    _dashboard_cache.clear_on_commit(object_session(target))
+
+def _clear_dashboard_cache_on_invoice_statement(orm_execute_state: ORMExecuteState) -> None:
+    # UPDATE/DELETE statements against invoices (payments, recalculated totals) skip the mapper events
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and orm_execute_state.bind_mapper is InvoiceModel.__mapper__:
+        _dashboard_cache.clear_on_commit(orm_execute_state.session)
+
+for _event_name in ("after_insert", "after_update", "after_delete"):
+    event.listen(InvoiceModel, _event_name, _invalidate_user_dashboards)
+# Invoices removed by ON DELETE CASCADE don't pass through the ORM either
+for _parent_model in (CustomerModel, OrganizationModel, UserModel):
+    event.listen(_parent_model, "after_delete", _clear_dashboard_cache)
+event.listen(Session, "do_orm_execute", _clear_dashboard_cache_on_invoice_statement)
+
+async def get_dashboard_stats_response(
+    db: AsyncSession,
+    *,
+    user_id: uuid.UUID,
+    organization_id: Optional[uuid.UUID] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None
+) -> Tuple[bytes, str]:
+    """
+    Get the JSON-encoded DashboardStats body and its ETag for these filters.
+    Served from a short-lived process-wide cache, so repeat dashboard loads skip the aggregate query.
+    """
+    async def load() -> Tuple[bytes, str]:
+        stats = await get_dashboard_stats(
+            db, user_id=user_id, organization_id=organization_id, date_from=date_from, date_to=date_to
+        )
+        body = orjson.dumps(DashboardStats.model_validate(stats).model_dump())
+        return body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+    cache_key = (user_id, organization_id, date_from, date_to, date.today())
+    return await _dashboard_cache.get_or_load(cache_key, load)
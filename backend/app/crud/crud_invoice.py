@@ -1,13 +1,34 @@
 # backend/app/crud/crud_invoice.py
+"""
+CRUD and financial helpers for invoices and their line items.
+
+Loader conventions: many-to-one relationships (organization, customer) use joinedload;
+any collection (line_items, item images, anything new) must use selectinload, never
+joinedload, to avoid multiplying rows. Read queries finish with raiseload("*") so an
+unplanned relationship access fails loudly instead of lazy-loading.
+"""
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy import event, func, insert, inspect, lambda_stmt, update as sqlalchemy_update
+from sqlalchemy.orm import selectinload, joinedload, raiseload
+from sqlalchemy.orm.attributes import set_committed_value
+import sys
 import uuid
+from contextvars import ContextVar
 from datetime import date
-from typing import List, Tuple, Optional 
+from decimal import Decimal, ROUND_HALF_EVEN
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional, Union 
+
+import numpy as np
+
+try: # Optional: JIT-compiles the subtotal kernel when numba is installed
+    from numba import njit
+except ImportError:
+    njit = None
 
 from app.models.invoice import Invoice as InvoiceModel, InvoiceItem as InvoiceItemModel
 from app.models.item import Item as ItemModel
+from app.models.organization import Organization as OrganizationModel
 from app.models.customer import Customer as CustomerModel
 from app.schemas.invoice import (
     InvoiceCreate,
@@ -22,10 +43,13 @@ from app.schemas.invoice import (
     DiscountTypeEnum
 )
 
-# Helper function to calculate a single line item's total
-def _calculate_line_item_total(item_data: InvoiceItemCreate) -> float:
-    """Helper to calculate a single line item's total."""
-    price = item_data.price or 0.0 
+# Line items as either request schemas or stored rows; the financial helpers only read
+# price, price_per_type, quantity_cartons and quantity_units, so both work unchanged.
+LineItemLike = Union[InvoiceItemCreate, InvoiceItemModel]
+
+# Helper function to resolve the quantity a line item is billed on
+def _billed_quantity(item_data: LineItemLike) -> float:
+    """Quantity matching the line's price_per_type, falling back to the other quantity field."""
     quantity = 0.0 
 
     if item_data.price_per_type == PricePerTypeEnum.CARTON:
@@ -45,46 +69,264 @@ def _calculate_line_item_total(item_data: InvoiceItemCreate) -> float:
             quantity = float(item_data.quantity_units)
         elif item_data.quantity_cartons is not None:
              quantity = float(item_data.quantity_cartons)
+    return quantity
+
+# Helper function to pair each line item's billed quantity with its price
+def _qty_price_iter(line_items_data: Iterable[LineItemLike]) -> Iterator[Tuple[float, float]]:
+    for item_data in line_items_data:
+        yield _billed_quantity(item_data), float(item_data.price or 0.0)
+
+# Money is rounded once per stored amount, to cents, with banker's rounding (ROUND_HALF_EVEN)
+# applied to the decimal value rather than to its binary float approximation.
+TWO_PLACES = Decimal("0.01")
+
+def _to_decimal(value: float) -> Decimal:
+    """Exact decimal form of the float as written (repr), e.g. 2.675 -> Decimal('2.675')."""
+    return Decimal(repr(float(value)))
+
+def _round_money(value: Decimal) -> Decimal:
+    return value.quantize(TWO_PLACES, rounding=ROUND_HALF_EVEN)
+
+# Helper function to calculate a single line item's exact, cent-rounded total
+def _line_total_decimal(quantity: float, price: float) -> Decimal:
+    return _round_money(_to_decimal(price) * _to_decimal(quantity))
+
+# Helper function to calculate a single line item's total
+def _calculate_line_item_total(item_data: LineItemLike) -> float:
+    """Helper to calculate a single line item's total."""
+    final_price = float(item_data.price or 0.0) 
+    calculated_total = _line_total_decimal(_billed_quantity(item_data), final_price)
+    return float(calculated_total)
+
+# Above this many line items the subtotal is summed with NumPy; below it the Python loop is cheaper
+_NUMPY_LINE_ITEM_THRESHOLD = 64
+
+# uint8 codes for price_per_type in the vectorized path (anything else, incl. UNIT, is 0)
+_PRICE_PER_TYPE_CODES = {PricePerTypeEnum.CARTON: 1}
+
+# Helper function to turn line items into aligned quantity/price arrays
+def _to_arrays(line_items_data: List[LineItemLike]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns (quantities, prices) as float64 arrays, resolving each line's billed quantity
+    with the same fallback as _calculate_line_item_total.
+    """
+    count = len(line_items_data)
+    prices = np.fromiter((i.price or 0.0 for i in line_items_data), dtype=np.float64, count=count)
+    cartons = np.fromiter(
+        (np.nan if i.quantity_cartons is None else i.quantity_cartons for i in line_items_data),
+        dtype=np.float64, count=count
+    )
+    units = np.fromiter(
+        (np.nan if i.quantity_units is None else i.quantity_units for i in line_items_data),
+        dtype=np.float64, count=count
+    )
+    price_per_type_codes = np.fromiter(
+        (_PRICE_PER_TYPE_CODES.get(i.price_per_type, 0) for i in line_items_data), dtype=np.uint8, count=count
+    )
+    is_carton = price_per_type_codes == _PRICE_PER_TYPE_CODES[PricePerTypeEnum.CARTON]
+
+    # Branch-free selection: CARTON prefers cartons and falls back to units; everything else
+    # prefers units. Missing quantities are NaN until the fallback resolves them (or zeroes them).
+    preferred = np.where(is_carton, cartons, units)
+    fallback = np.where(is_carton, units, cartons)
+    quantities = np.where(np.isnan(preferred), np.nan_to_num(fallback), preferred)
+    return quantities, prices
+
+# Line totals in the vectorized path are whole cents: the product in cents is first rounded to
+# 6 places to shed binary noise (267.49999999999997 -> 267.5), then rounded half-to-even.
+_CENTS_NOISE_DECIMALS = 6
+
+# Compiled multiply-round-accumulate (in cents) over the _to_arrays output, or None without numba.
+# The explicit signature compiles it at import; the on-disk cache is skipped in the frozen build.
+_subtotal_cents_kernel = None
+if njit is not None:
+    @njit("float64(float64[::1], float64[::1])", cache=not getattr(sys, "frozen", False), fastmath=True)
+    def _subtotal_cents_kernel(quantities, prices):
+        subtotal_cents = 0.0
+        for i in range(quantities.shape[0]):
+            subtotal_cents += np.rint(round(quantities[i] * prices[i] * 100.0, _CENTS_NOISE_DECIMALS))
+        return subtotal_cents
+
+# Helper function to sum line totals in one vectorized pass
+def _sum_line_totals_vectorized(line_items_data: List[LineItemLike]) -> float:
+    """
+    NumPy equivalent of summing _calculate_line_item_total over every line item.
+    Lines are rounded to whole cents and summed as integers, so the subtotal matches the
+    stored line totals exactly.
+    """
+    quantities, prices = _to_arrays(line_items_data)
+    if _subtotal_cents_kernel is not None:
+        return int(_subtotal_cents_kernel(quantities, prices)) / 100.0
+    line_cents = np.rint(np.round(quantities * prices * 100.0, _CENTS_NOISE_DECIMALS)).astype(np.int64)
+    return int(line_cents.sum()) / 100.0
+
+# Per-request memo for calculate_invoice_financials; cleared by deps.invoice_financials_cache_scope
+_financials_cache: ContextVar[Optional[Dict[tuple, Tuple[float, float, float, float]]]] = ContextVar(
+    "invoice_financials_cache", default=None
+)
+
+def reset_invoice_financials_cache() -> None:
+    """Starts an empty financials memo for the current request context."""
+    _financials_cache.set({})
 
-    final_price = float(price) 
-    calculated_total = round(final_price * quantity, 2)
-    return calculated_total
+def clear_invoice_financials_cache() -> None:
+    """Drops the financials memo of the current request context."""
+    _financials_cache.set(None)
 
 # Helper function to calculate invoice totals
 def calculate_invoice_financials(
-    line_items_data: List[InvoiceItemCreate], 
+    line_items_data: List[LineItemLike], 
     invoice_currency: str, 
     tax_percentage: Optional[float] = None,
     discount_percentage: Optional[float] = None,
     discount_type: DiscountTypeEnum = DiscountTypeEnum.PERCENTAGE,
-    manual_discount_amount: Optional[float] = None
+    manual_discount_amount: Optional[float] = None,
+    vectorized: Optional[bool] = None
 ) -> Tuple[float, float, float, float]:
     """
     Calculates subtotal, tax, discount, and total for an invoice.
+    Results are memoized for the current request when a cache scope is active.
+    `vectorized` forces the NumPy (True) or Python (False) subtotal; by default it depends on size.
     """
-    subtotal = 0.0
-    for item_data in line_items_data:
-        line_total = _calculate_line_item_total(item_data)
-        subtotal += line_total
+    cache = _financials_cache.get()
+    cache_key = None
+    if cache is not None:
+        cache_key = (
+            tuple(
+                (i.price, i.price_per_type, i.quantity_cartons, i.quantity_units)
+                for i in line_items_data
+            ),
+            tax_percentage, discount_percentage, discount_type, manual_discount_amount
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    if vectorized is None:
+        vectorized = len(line_items_data) > _NUMPY_LINE_ITEM_THRESHOLD
+    if vectorized:
+        subtotal = _sum_line_totals_vectorized(line_items_data)
+    else:
+        subtotal = float(sum(
+            (_line_total_decimal(quantity, price) for quantity, price in _qty_price_iter(line_items_data)),
+            Decimal(0)
+        ))
     
-    subtotal = round(subtotal, 2) 
+    result = _calculate_financials_from_subtotal(
+        subtotal,
+        tax_percentage=tax_percentage,
+        discount_percentage=discount_percentage,
+        discount_type=discount_type,
+        manual_discount_amount=manual_discount_amount
+    )
+    if cache is not None:
+        cache[cache_key] = result
+    return result
 
-    calculated_tax_amount = 0.0
+# Helper function to derive tax, discount and total from an already known subtotal
+def _calculate_financials_from_subtotal(
+    subtotal: float,
+    tax_percentage: Optional[float] = None,
+    discount_percentage: Optional[float] = None,
+    discount_type: DiscountTypeEnum = DiscountTypeEnum.PERCENTAGE,
+    manual_discount_amount: Optional[float] = None
+) -> Tuple[float, float, float, float]:
+    """
+    Applies tax and discount to a subtotal. Lets callers that track the subtotal
+    incrementally skip re-summing every line item.
+    """
+    subtotal_d = _round_money(_to_decimal(subtotal)) 
+
+    calculated_tax_amount = Decimal(0)
     if tax_percentage is not None and tax_percentage > 0:
-        calculated_tax_amount = round(subtotal * (tax_percentage / 100.0), 2)
+        calculated_tax_amount = _round_money(subtotal_d * _to_decimal(tax_percentage) / 100)
 
-    calculated_discount_amount = 0.0
+    calculated_discount_amount = Decimal(0)
     if discount_type == DiscountTypeEnum.PERCENTAGE:
         if discount_percentage is not None and discount_percentage > 0:
-            calculated_discount_amount = round(subtotal * (discount_percentage / 100.0), 2)
+            calculated_discount_amount = _round_money(subtotal_d * _to_decimal(discount_percentage) / 100)
     elif discount_type == DiscountTypeEnum.FIXED:
         if manual_discount_amount is not None and manual_discount_amount > 0:
-            calculated_discount_amount = round(manual_discount_amount, 2)
+            calculated_discount_amount = _round_money(_to_decimal(manual_discount_amount))
     
-    calculated_discount_amount = min(calculated_discount_amount, subtotal) 
+    calculated_discount_amount = min(calculated_discount_amount, subtotal_d) 
 
-    total = round(subtotal + calculated_tax_amount - calculated_discount_amount, 2)
-    return subtotal, calculated_tax_amount, calculated_discount_amount, total
+    # Exact in Decimal: every term is already whole cents
+    total = subtotal_d + calculated_tax_amount - calculated_discount_amount
+    return float(subtotal_d), float(calculated_tax_amount), float(calculated_discount_amount), float(total)
+
+
+# Helper function to resolve the status/amount_paid pair for a requested change
+def _resolve_payment_state(
+    current_status: InvoiceStatusEnum,
+    current_amount_paid: float,
+    total_amount: float,
+    requested_status: Optional[InvoiceStatusEnum] = None,
+    requested_amount_paid: Optional[float] = None
+) -> Tuple[InvoiceStatusEnum, float]:
+    """
+    Applies the invoice payment rules and returns the resulting (status, amount_paid).
+    """
+    new_status = current_status
+    new_amount_paid = current_amount_paid
+
+    if requested_status is not None:
+        new_status = requested_status
+        if new_status == InvoiceStatusEnum.PAID:
+            new_amount_paid = requested_amount_paid if requested_amount_paid is not None else total_amount
+        elif new_status in [InvoiceStatusEnum.UNPAID, InvoiceStatusEnum.OVERDUE, InvoiceStatusEnum.CANCELLED]:
+            if current_status != InvoiceStatusEnum.PARTIALLY_PAID and requested_amount_paid is None:
+                 new_amount_paid = 0.0
+            elif requested_amount_paid is not None:
+                 new_amount_paid = requested_amount_paid
+        elif new_status == InvoiceStatusEnum.DRAFT and requested_amount_paid is None:
+            new_amount_paid = 0.0
+    
+    if requested_amount_paid is not None:
+        new_amount_paid = requested_amount_paid
+        if requested_status is None:
+            if new_amount_paid >= total_amount and total_amount > 0:
+                new_status = InvoiceStatusEnum.PAID
+            elif new_amount_paid > 0 and new_amount_paid < total_amount:
+                new_status = InvoiceStatusEnum.PARTIALLY_PAID
+            elif new_amount_paid <= 0:
+                if new_status not in [InvoiceStatusEnum.DRAFT, InvoiceStatusEnum.CANCELLED]:
+                    new_status = InvoiceStatusEnum.UNPAID
+
+    return new_status, new_amount_paid
+
+
+# Attributes reloaded on a just-written invoice instead of re-fetching it through get_invoice:
+# the server-generated columns plus the relationships the Invoice response model serializes.
+_INVOICE_REFRESH_ATTRIBUTES = [
+    "invoice_date", "created_at", "updated_at", "customer_company_name_snapshot",
+    "organization", "customer", "line_items"
+]
+
+
+# Invoice.customer_company_name_snapshot follows the customer's company_name. When an invoice is
+# written with a new customer_id, the name is filled in by a subquery inside the same INSERT/UPDATE;
+# when a customer is renamed, its invoices are updated in the same flush.
+_CUSTOMER_COMPANY_NAME = select(CustomerModel.company_name)
+
+def _snapshot_customer_company_name(_mapper, _connection, target: InvoiceModel) -> None:
+    if inspect(target).attrs.customer_id.history.has_changes():
+        target.customer_company_name_snapshot = (
+            _CUSTOMER_COMPANY_NAME.where(CustomerModel.id == target.customer_id).scalar_subquery()
+        )
+
+def _propagate_customer_company_name(_mapper, connection, target: CustomerModel) -> None:
+    if inspect(target).attrs.company_name.history.has_changes():
+        invoices = InvoiceModel.__table__
+        connection.execute(
+            invoices.update()
+            .where(invoices.c.customer_id == target.id)
+            .values(customer_company_name_snapshot=target.company_name)
+        )
+
+for _event_name in ("before_insert", "before_update"):
+    event.listen(InvoiceModel, _event_name, _snapshot_customer_company_name)
+event.listen(CustomerModel, "after_update", _propagate_customer_company_name)
 
 
 async def get_invoice(db: AsyncSession, invoice_id: uuid.UUID) -> Optional[InvoiceModel]:
@@ -95,11 +337,13 @@ async def get_invoice(db: AsyncSession, invoice_id: uuid.UUID) -> Optional[Invoi
     result = await db.execute(
         select(InvoiceModel)
         .options(
-            joinedload(InvoiceModel.organization), 
+            joinedload(InvoiceModel.organization) # PDF rendering reads the org's selected template
+            .joinedload(OrganizationModel.selected_invoice_template),
             joinedload(InvoiceModel.customer),   
             selectinload(InvoiceModel.line_items) 
             .selectinload(InvoiceItemModel.item)  
-            .selectinload(ItemModel.images)       
+            .selectinload(ItemModel.images),
+            raiseload("*")
         )
         .filter(InvoiceModel.id == invoice_id)
     )
@@ -113,20 +357,30 @@ async def get_invoices_by_user(
     invoice_number_search: Optional[str] = None, date_from: Optional[date] = None,
     date_to: Optional[date] = None, skip: int = 0, limit: int = 100
 ) -> List[InvoiceModel]:
-    query = (
-        select(InvoiceModel)
-        .options(joinedload(InvoiceModel.customer)) 
+    # lambda_stmt caches the compiled SQL per filter combination; closure values become bound parameters
+    stmt = lambda_stmt(
+        lambda: select(InvoiceModel)
+        .options(
+            # selectinload already batches the parent keys 500 per IN query. raiseload("*") below only
+            # covers Invoice's own relationships, so guard line_items' (item, invoice) explicitly.
+            selectinload(InvoiceModel.line_items).raiseload("*"),
+            # No customer join: list rows carry customer_company_name_snapshot
+            raiseload("*") # Any other relationship access on list rows is a bug, not a lazy load
+        )
         .filter(InvoiceModel.user_id == user_id)
         .order_by(InvoiceModel.invoice_date.desc(), InvoiceModel.invoice_number.desc())
     )
-    if organization_id: query = query.filter(InvoiceModel.organization_id == organization_id)
-    if status: query = query.filter(InvoiceModel.status == status)
-    if customer_id: query = query.filter(InvoiceModel.customer_id == customer_id)
-    if invoice_number_search: query = query.filter(InvoiceModel.invoice_number.ilike(f"%{invoice_number_search}%"))
-    if date_from: query = query.filter(InvoiceModel.invoice_date >= date_from)
-    if date_to: query = query.filter(InvoiceModel.invoice_date <= date_to)
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
+    if organization_id: stmt += lambda s: s.filter(InvoiceModel.organization_id == organization_id)
+    if status: stmt += lambda s: s.filter(InvoiceModel.status == status)
+    if customer_id: stmt += lambda s: s.filter(InvoiceModel.customer_id == customer_id)
+    if invoice_number_search:
+        search_pattern = f"%{invoice_number_search}%"
+        # Served by the ix_invoices_invoice_number_trgm GIN index despite the leading wildcard
+        stmt += lambda s: s.filter(InvoiceModel.invoice_number.ilike(search_pattern))
+    if date_from: stmt += lambda s: s.filter(InvoiceModel.invoice_date >= date_from)
+    if date_to: stmt += lambda s: s.filter(InvoiceModel.invoice_date <= date_to)
+    stmt += lambda s: s.offset(skip).limit(limit)
+    result = await db.execute(stmt)
     return result.scalars().all()
 
 
@@ -168,22 +422,75 @@ async def create_invoice_with_items(
         total_amount=total, status=final_status
     )
     db.add(db_invoice)
-    for item_data_schema in invoice_in.line_items:
-        item_line_db_total = _calculate_line_item_total(item_data_schema) 
-        db_item_data = item_data_schema.model_dump()
-        db_item = InvoiceItemModel(**db_item_data, line_total=item_line_db_total)
-        db_item.invoice = db_invoice 
-        db.add(db_item)
+    await db.flush() # Populate db_invoice.id for the line item rows
+    line_item_rows = [
+        {**item_data_schema.model_dump(), "invoice_id": db_invoice.id, "line_total": _calculate_line_item_total(item_data_schema)}
+        for item_data_schema in invoice_in.line_items
+    ]
+    if line_item_rows:
+        # One multi-row INSERT instead of an ORM object (and unit-of-work entry) per line item.
+        # The line_items collection is left unloaded, so the refresh below fetches it fresh.
+        await db.execute(insert(InvoiceItemModel), line_item_rows)
     await db.commit()
-    refreshed_invoice = await get_invoice(db, invoice_id=db_invoice.id)
-    if refreshed_invoice is None: raise Exception("Failed to retrieve created invoice after commit.")
-    return refreshed_invoice
+    await db.refresh(db_invoice, attribute_names=_INVOICE_REFRESH_ATTRIBUTES)
+    return db_invoice
+
+
+# Helper function to replace an invoice's line items by writing only the rows that changed
+def _apply_line_item_changes(db_invoice: InvoiceModel, line_items_in: List[InvoiceItemCreate]) -> List[dict]:
+    """
+    Makes db_invoice.line_items match line_items_in without clearing the collection.
+    Incoming rows identical to a stored row keep it untouched; the remaining stored rows are
+    overwritten in order and leftover stored rows are removed (the delete-orphan cascade
+    deletes them). Extra incoming rows are returned as insert-ready dicts for the caller's
+    multi-row INSERT, so only the deltas reach the database.
+    """
+    fields = list(InvoiceItemCreate.model_fields) + ["line_total"]
+
+    unmatched_existing: Dict[tuple, List[InvoiceItemModel]] = {}
+    for db_line_item in db_invoice.line_items:
+        key = tuple(getattr(db_line_item, field) for field in fields)
+        unmatched_existing.setdefault(key, []).append(db_line_item)
+
+    changed_values: List[dict] = []
+    for item_data_schema in line_items_in:
+        item_values = item_data_schema.model_dump()
+        item_values["line_total"] = _calculate_line_item_total(item_data_schema)
+        matches = unmatched_existing.get(tuple(item_values[field] for field in fields))
+        if matches:
+            matches.pop() # Unchanged row: nothing to write
+        else:
+            changed_values.append(item_values)
+
+    reusable_rows = [db_line_item for rows in unmatched_existing.values() for db_line_item in rows]
+    for db_line_item, item_values in zip(reusable_rows, changed_values):
+        for field, value in item_values.items():
+            setattr(db_line_item, field, value)
+    for db_line_item in reusable_rows[len(changed_values):]:
+        db_invoice.line_items.remove(db_line_item)
+    return [
+        {**item_values, "invoice_id": db_invoice.id}
+        for item_values in changed_values[len(reusable_rows):]
+    ]
 
 
 async def update_invoice_with_items(
     db: AsyncSession, *, db_invoice: InvoiceModel, invoice_in: InvoiceUpdate
 ) -> InvoiceModel:
-    if 'line_items' in invoice_in.model_fields_set:
+    # Fast path: a status/amount_paid-only change ("mark as paid") leaves the totals untouched,
+    # so skip the recalculation and the re-fetch and persist just those two columns.
+    if invoice_in.model_fields_set and invoice_in.model_fields_set <= {"status", "amount_paid"}:
+        new_status, new_amount_paid = _resolve_payment_state(
+            current_status=db_invoice.status,
+            current_amount_paid=db_invoice.amount_paid,
+            total_amount=db_invoice.total_amount,
+            requested_status=invoice_in.status,
+            requested_amount_paid=invoice_in.amount_paid
+        )
+        return await set_invoice_payment(db, db_invoice=db_invoice, status=new_status, amount_paid=new_amount_paid)
+
+    # Routes pass invoices from get_invoice with line_items already loaded; only load them if not
+    if 'line_items' in inspect(db_invoice).unloaded:
         await db.refresh(db_invoice, attribute_names=['line_items'])
 
     update_data_header = invoice_in.model_dump(exclude_unset=True, exclude={'line_items'})
@@ -193,39 +500,16 @@ async def update_invoice_with_items(
         if field not in ["amount_paid", "status"]:
             setattr(db_invoice, field, value)
 
-    line_items_for_calculation: List[InvoiceItemCreate]
+    line_items_for_calculation: List[LineItemLike]
 
     if 'line_items' in invoice_in.model_fields_set and invoice_in.line_items is not None:
-        db_invoice.line_items.clear() 
-        new_orm_line_items = []
-        for item_data_schema in invoice_in.line_items:
-            item_line_total = _calculate_line_item_total(item_data_schema)
-            db_item_data_dict = item_data_schema.model_dump()
-            new_db_item = InvoiceItemModel(**db_item_data_dict, line_total=item_line_total)
-            new_orm_line_items.append(new_db_item)
-        db_invoice.line_items = new_orm_line_items
+        new_line_item_rows = _apply_line_item_changes(db_invoice, invoice_in.line_items)
+        if new_line_item_rows:
+            # Added rows go out as one multi-row INSERT; the refresh after commit picks them up
+            await db.execute(insert(InvoiceItemModel), new_line_item_rows)
         line_items_for_calculation = list(invoice_in.line_items)
     else:
-        if not db_invoice.line_items or not all(isinstance(li, InvoiceItemModel) for li in db_invoice.line_items):
-            await db.refresh(db_invoice, attribute_names=['line_items'])
-        line_items_for_calculation = []
-        for orm_item in db_invoice.line_items:
-            line_items_for_calculation.append(
-                InvoiceItemCreate(
-                    item_description=orm_item.item_description,
-                    quantity_cartons=orm_item.quantity_cartons,
-                    quantity_units=orm_item.quantity_units,
-                    unit_type=orm_item.unit_type,
-                    price=orm_item.price,
-                    price_per_type=orm_item.price_per_type,
-                    currency=orm_item.currency,
-                    item_specific_comments=orm_item.item_specific_comments,
-                    item_id=orm_item.item_id,
-                    net_weight_kgs=orm_item.net_weight_kgs,
-                    gross_weight_kgs=orm_item.gross_weight_kgs,
-                    measurement_cbm=orm_item.measurement_cbm
-                )
-            )
+        line_items_for_calculation = list(db_invoice.line_items)
     
     subtotal, tax_amt, discount_amt, total = calculate_invoice_financials(
         line_items_data=line_items_for_calculation, 
@@ -233,7 +517,8 @@ async def update_invoice_with_items(
         tax_percentage=db_invoice.tax_percentage,
         discount_percentage=db_invoice.discount_percentage,
         discount_type=db_invoice.discount_type,
-        manual_discount_amount=update_data_header.get('discount_amount', db_invoice.discount_amount)
+        manual_discount_amount=update_data_header.get('discount_amount', db_invoice.discount_amount),
+        vectorized=True
     )
     
     db_invoice.subtotal_amount = subtotal
@@ -241,39 +526,19 @@ async def update_invoice_with_items(
     db_invoice.discount_amount = discount_amt
     db_invoice.total_amount = total
 
-    requested_amount_paid = update_data_header.get("amount_paid") 
-    requested_status = update_data_header.get("status")
-
-    if requested_status is not None:
-        db_invoice.status = requested_status
-        if db_invoice.status == InvoiceStatusEnum.PAID:
-            db_invoice.amount_paid = requested_amount_paid if requested_amount_paid is not None else db_invoice.total_amount
-        elif db_invoice.status in [InvoiceStatusEnum.UNPAID, InvoiceStatusEnum.OVERDUE, InvoiceStatusEnum.CANCELLED]:
-            if original_status != InvoiceStatusEnum.PARTIALLY_PAID and requested_amount_paid is None:
-                 db_invoice.amount_paid = 0.0
-            elif requested_amount_paid is not None:
-                 db_invoice.amount_paid = requested_amount_paid
-        elif db_invoice.status == InvoiceStatusEnum.DRAFT and requested_amount_paid is None:
-            db_invoice.amount_paid = 0.0
-    
-    if requested_amount_paid is not None:
-        db_invoice.amount_paid = requested_amount_paid
-        if requested_status is None:
-            if db_invoice.amount_paid >= db_invoice.total_amount and db_invoice.total_amount > 0:
-                db_invoice.status = InvoiceStatusEnum.PAID
-            elif db_invoice.amount_paid > 0 and db_invoice.amount_paid < db_invoice.total_amount:
-                db_invoice.status = InvoiceStatusEnum.PARTIALLY_PAID
-            elif db_invoice.amount_paid <= 0:
-                if db_invoice.status not in [InvoiceStatusEnum.DRAFT, InvoiceStatusEnum.CANCELLED]:
-                    db_invoice.status = InvoiceStatusEnum.UNPAID
+    new_status, new_amount_paid = _resolve_payment_state(
+        current_status=original_status,
+        current_amount_paid=db_invoice.amount_paid,
+        total_amount=db_invoice.total_amount,
+        requested_status=update_data_header.get("status"),
+        requested_amount_paid=update_data_header.get("amount_paid")
+    )
+    db_invoice.status = new_status
+    db_invoice.amount_paid = new_amount_paid
     
-    db.add(db_invoice)
     await db.commit()
-    
-    refreshed_invoice = await get_invoice(db, invoice_id=db_invoice.id)
-    if refreshed_invoice is None:
-        raise Exception(f"Failed to retrieve updated invoice (ID: {db_invoice.id}) after commit.")
-    return refreshed_invoice
+    await db.refresh(db_invoice, attribute_names=_INVOICE_REFRESH_ATTRIBUTES)
+    return db_invoice
 
 
 async def delete_invoice(db: AsyncSession, *, db_invoice: InvoiceModel) -> InvoiceModel:
@@ -288,30 +553,20 @@ async def get_invoice_line_item(db: AsyncSession, invoice_item_id: uuid.UUID) ->
 async def add_line_item_to_invoice(
     db: AsyncSession, *, item_in: InvoiceItemCreate, invoice_id: uuid.UUID
 ) -> InvoiceItemModel:
-    parent_invoice = await get_invoice(db, invoice_id=invoice_id) 
+    # Only the header is needed: the new subtotal is derived from the stored one,
+    # so sibling line items are never loaded.
+    parent_invoice = await db.get(InvoiceModel, invoice_id, options=[raiseload(InvoiceModel.line_items)])
     if not parent_invoice: raise ValueError(f"Invoice with id {invoice_id} not found.")
     line_total = _calculate_line_item_total(item_in)
     db_item_data_dict = item_in.model_dump()
     db_item = InvoiceItemModel(**db_item_data_dict, invoice_id=invoice_id, line_total=line_total)
     db.add(db_item)
-    await db.flush([db_item]) 
-    await db.refresh(parent_invoice, attribute_names=['line_items']) 
-    
-    all_line_items_data: List[InvoiceItemCreate] = []
-    if parent_invoice.line_items:
-        for li_orm in parent_invoice.line_items:
-            all_line_items_data.append(
-                InvoiceItemCreate(
-                    item_description=li_orm.item_description, quantity_cartons=li_orm.quantity_cartons,
-                    quantity_units=li_orm.quantity_units, unit_type=li_orm.unit_type, price=li_orm.price,
-                    price_per_type=li_orm.price_per_type, currency=li_orm.currency,
-                    item_specific_comments=li_orm.item_specific_comments, item_id=li_orm.item_id,
-                    net_weight_kgs=li_orm.net_weight_kgs, gross_weight_kgs=li_orm.gross_weight_kgs,
-                    measurement_cbm=li_orm.measurement_cbm
-                )
-            )
-    subtotal, tax_amt, discount_amt, total = calculate_invoice_financials(
-        line_items_data=all_line_items_data, invoice_currency=parent_invoice.currency,
+    # db.get returns an invoice already in the session as-is; keep its loaded collection in step
+    if 'line_items' not in inspect(parent_invoice).unloaded:
+        parent_invoice.line_items.append(db_item)
+
+    subtotal, tax_amt, discount_amt, total = _calculate_financials_from_subtotal(
+        float(_to_decimal(parent_invoice.subtotal_amount or 0.0) + _to_decimal(line_total)),
         tax_percentage=parent_invoice.tax_percentage, discount_percentage=parent_invoice.discount_percentage,
         discount_type=parent_invoice.discount_type,
         manual_discount_amount=parent_invoice.discount_amount
@@ -320,91 +575,63 @@ async def add_line_item_to_invoice(
     parent_invoice.tax_amount = tax_amt
     parent_invoice.discount_amount = discount_amt
     parent_invoice.total_amount = total
-    db.add(parent_invoice)
     await db.commit()
-    await db.refresh(db_item); await db.refresh(parent_invoice)
     return db_item
 
+async def _recompute_totals_in_db(db: AsyncSession, *, invoice_id: uuid.UUID) -> bool:
+    """
+    Re-derives an invoice's header totals from SUM(line_total) computed by the database and
+    writes them back with one UPDATE, without loading the line items or the invoice object.
+    Pending line item changes must be flushed first. Returns False if the invoice doesn't exist.
+    """
+    line_total_sum = (
+        select(func.coalesce(func.sum(InvoiceItemModel.line_total), 0.0))
+        .where(InvoiceItemModel.invoice_id == invoice_id)
+        .scalar_subquery()
+    )
+    header = (await db.execute(
+        select(
+            InvoiceModel.tax_percentage, InvoiceModel.discount_percentage,
+            InvoiceModel.discount_type, InvoiceModel.discount_amount, line_total_sum
+        ).where(InvoiceModel.id == invoice_id)
+    )).first()
+    if header is None:
+        return False
+
+    tax_percentage, discount_percentage, discount_type, discount_amount, subtotal = header
+    subtotal, tax_amt, discount_amt, total = _calculate_financials_from_subtotal(
+        subtotal,
+        tax_percentage=tax_percentage, discount_percentage=discount_percentage,
+        discount_type=discount_type,
+        manual_discount_amount=discount_amount
+    )
+    await db.execute(
+        sqlalchemy_update(InvoiceModel)
+        .where(InvoiceModel.id == invoice_id)
+        .values(subtotal_amount=subtotal, tax_amount=tax_amt, discount_amount=discount_amt, total_amount=total)
+    )
+    return True
+
 async def update_invoice_line_item(
     db: AsyncSession, *, db_line_item: InvoiceItemModel, item_in: InvoiceItemUpdate
 ) -> InvoiceItemModel:
     update_data = item_in.model_dump(exclude_unset=True)
     for field, value in update_data.items(): setattr(db_line_item, field, value)
-    temp_item_for_calc = InvoiceItemCreate(
-        item_description=db_line_item.item_description, quantity_cartons=db_line_item.quantity_cartons,
-        quantity_units=db_line_item.quantity_units, unit_type=db_line_item.unit_type, price=db_line_item.price,
-        price_per_type=db_line_item.price_per_type, currency=db_line_item.currency,
-        item_specific_comments=db_line_item.item_specific_comments, item_id=db_line_item.item_id,
-        net_weight_kgs=db_line_item.net_weight_kgs, gross_weight_kgs=db_line_item.gross_weight_kgs,
-        measurement_cbm=db_line_item.measurement_cbm
-    )
-    db_line_item.line_total = _calculate_line_item_total(temp_item_for_calc)
-    db.add(db_line_item)
-    
-    parent_invoice = await get_invoice(db, invoice_id=db_line_item.invoice_id) 
-    if not parent_invoice: raise ValueError("Parent invoice not found for line item.")
+    db_line_item.line_total = _calculate_line_item_total(db_line_item)
     
-    all_line_items_data: List[InvoiceItemCreate] = []
-    if parent_invoice.line_items:
-        for li_orm in parent_invoice.line_items:
-            all_line_items_data.append(
-                 InvoiceItemCreate(
-                    item_description=li_orm.item_description, quantity_cartons=li_orm.quantity_cartons,
-                    quantity_units=li_orm.quantity_units, unit_type=li_orm.unit_type, price=li_orm.price,
-                    price_per_type=li_orm.price_per_type, currency=li_orm.currency,
-                    item_specific_comments=li_orm.item_specific_comments, item_id=li_orm.item_id,
-                    net_weight_kgs=li_orm.net_weight_kgs, gross_weight_kgs=li_orm.gross_weight_kgs,
-                    measurement_cbm=li_orm.measurement_cbm
-                )
-            )
-    subtotal, tax_amt, discount_amt, total = calculate_invoice_financials(
-        line_items_data=all_line_items_data, invoice_currency=parent_invoice.currency,
-        tax_percentage=parent_invoice.tax_percentage, discount_percentage=parent_invoice.discount_percentage,
-        discount_type=parent_invoice.discount_type,
-        manual_discount_amount=parent_invoice.discount_amount
-    )
-    parent_invoice.subtotal_amount = subtotal
-    parent_invoice.tax_amount = tax_amt
-    parent_invoice.discount_amount = discount_amt
-    parent_invoice.total_amount = total
-    db.add(parent_invoice)
+    await db.flush() # The aggregate below must see the new line_total
+    if not await _recompute_totals_in_db(db, invoice_id=db_line_item.invoice_id):
+        raise ValueError("Parent invoice not found for line item.")
     await db.commit()
-    await db.refresh(db_line_item); await db.refresh(parent_invoice)
+    await db.refresh(db_line_item)
     return db_line_item
 
 async def delete_invoice_line_item(db: AsyncSession, *, db_line_item: InvoiceItemModel) -> InvoiceItemModel:
     parent_invoice_id = db_line_item.invoice_id
     await db.delete(db_line_item)
     
-    parent_invoice = await get_invoice(db, invoice_id=parent_invoice_id) 
-    if not parent_invoice:
-        await db.commit() 
-        return db_line_item 
-        
-    all_line_items_data: List[InvoiceItemCreate] = []
-    if parent_invoice.line_items: 
-        for li_orm in parent_invoice.line_items:
-            all_line_items_data.append(
-                InvoiceItemCreate(
-                    item_description=li_orm.item_description, quantity_cartons=li_orm.quantity_cartons,
-                    quantity_units=li_orm.quantity_units, unit_type=li_orm.unit_type, price=li_orm.price,
-                    price_per_type=li_orm.price_per_type, currency=li_orm.currency,
-                    item_specific_comments=li_orm.item_specific_comments, item_id=li_orm.item_id,
-                    net_weight_kgs=li_orm.net_weight_kgs, gross_weight_kgs=li_orm.gross_weight_kgs,
-                    measurement_cbm=li_orm.measurement_cbm
-                )
-            )
-    subtotal, tax_amt, discount_amt, total = calculate_invoice_financials(
-        line_items_data=all_line_items_data, invoice_currency=parent_invoice.currency,
-        tax_percentage=parent_invoice.tax_percentage, discount_percentage=parent_invoice.discount_percentage,
-        discount_type=parent_invoice.discount_type,
-        manual_discount_amount=parent_invoice.discount_amount
-    )
-    parent_invoice.subtotal_amount = subtotal
-    parent_invoice.tax_amount = tax_amt
-    parent_invoice.discount_amount = discount_amt
-    parent_invoice.total_amount = total
-    db.add(parent_invoice)
+    await db.flush() # The aggregate below must no longer count the deleted row
+    await _recompute_totals_in_db(db, invoice_id=parent_invoice_id)
     await db.commit() 
     return db_line_item
 
@@ -513,6 +740,29 @@ async def create_packing_list_from_commercial(
       return new_packing_list_invoice
 
 
+async def set_invoice_payment(
+    db: AsyncSession, *, db_invoice: InvoiceModel, status: InvoiceStatusEnum, amount_paid: float
+) -> InvoiceModel:
+    """
+    Persists only status and amount_paid with a single UPDATE ... RETURNING.
+    No SELECT and no financial recalculation; callers resolve the final values first.
+    """
+    result = await db.execute(
+        sqlalchemy_update(InvoiceModel)
+        .where(InvoiceModel.id == db_invoice.id)
+        .values(status=status, amount_paid=amount_paid)
+        .returning(InvoiceModel.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    updated_at = result.scalar_one()
+    await db.commit()
+    # Mirror the new row state onto the loaded instance without marking it dirty
+    set_committed_value(db_invoice, "status", status)
+    set_committed_value(db_invoice, "amount_paid", amount_paid)
+    set_committed_value(db_invoice, "updated_at", updated_at)
+    return db_invoice
+
+
 async def record_payment_for_invoice(
     db: AsyncSession,
     *,
@@ -520,20 +770,20 @@ async def record_payment_for_invoice(
     payment_in: PaymentRecordIn
 ) -> InvoiceModel:
     current_amount_paid_on_invoice = db_invoice.amount_paid if db_invoice.amount_paid is not None else 0.0
-    new_total_amount_paid = round(current_amount_paid_on_invoice + payment_in.amount_paid_now, 2)
-    
-    db_invoice.amount_paid = new_total_amount_paid
-
-    if abs(db_invoice.amount_paid - db_invoice.total_amount) < 0.01 and db_invoice.total_amount > 0: 
-        db_invoice.status = InvoiceStatusEnum.PAID
-        db_invoice.amount_paid = db_invoice.total_amount 
-    elif db_invoice.amount_paid > 0 and db_invoice.amount_paid < db_invoice.total_amount:
-        db_invoice.status = InvoiceStatusEnum.PARTIALLY_PAID
-    elif db_invoice.amount_paid <= 0: 
+    new_total_amount_paid = float(_round_money(
+        _to_decimal(current_amount_paid_on_invoice) + _to_decimal(payment_in.amount_paid_now)
+    ))
+    new_status = db_invoice.status
+
+    if abs(new_total_amount_paid - db_invoice.total_amount) < 0.01 and db_invoice.total_amount > 0: 
+        new_status = InvoiceStatusEnum.PAID
+        new_total_amount_paid = db_invoice.total_amount 
+    elif new_total_amount_paid > 0 and new_total_amount_paid < db_invoice.total_amount:
+        new_status = InvoiceStatusEnum.PARTIALLY_PAID
+    elif new_total_amount_paid <= 0: 
         if db_invoice.status not in [InvoiceStatusEnum.DRAFT, InvoiceStatusEnum.CANCELLED]:
-            db_invoice.status = InvoiceStatusEnum.UNPAID
+            new_status = InvoiceStatusEnum.UNPAID
     
-    db.add(db_invoice)
-    await db.commit()
-    await db.refresh(db_invoice) 
-    return db_invoice
\ No newline at end of file
+    return await set_invoice_payment(
+        db, db_invoice=db_invoice, status=new_status, amount_paid=new_total_amount_paid
+    )
\ No newline at end of file
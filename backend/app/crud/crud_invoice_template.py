@@ -1,13 +1,27 @@
 # backend/app/crud/crud_invoice_template.py
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func, update as sqlalchemy_update
+from sqlalchemy import event, exists, lambda_stmt, update as sqlalchemy_update
+from sqlalchemy.orm import object_session
 import uuid
 from typing import List, Optional
 
+from app.db.cache import ProcessCache
 from app.models.invoice_template import InvoiceTemplate as InvoiceTemplateModel
 from app.schemas.invoice_template import InvoiceTemplateCreate, InvoiceTemplateUpdate
 
+# Process-wide cache for get_system_default_template. The default almost never changes,
+# so it is kept for a minute and dropped whenever an invoice template is written, and again
+# once that write commits or rolls back. "No default" is cached too.
+_SYSTEM_DEFAULT_CACHE_KEY = "system_default"
+_system_default_cache = ProcessCache(maxsize=1, ttl=60, cache_none=True)
+
+def _invalidate_system_default_cache(_mapper, _connection, target: InvoiceTemplateModel) -> None:
+    _system_default_cache.clear_on_commit(object_session(target))
+
+for _event_name in ("after_insert", "after_update", "after_delete"):
+    event.listen(InvoiceTemplateModel, _event_name, _invalidate_system_default_cache)
+
 async def get_invoice_template(db: AsyncSession, template_id: uuid.UUID) -> Optional[InvoiceTemplateModel]:
     """
     Get a single invoice template by its ID.
@@ -32,22 +46,58 @@ async def get_invoice_template_by_path(db: AsyncSession, file_path: str) -> Opti
 async def get_system_default_template(db: AsyncSession) -> Optional[InvoiceTemplateModel]:
     """
     Get the system default invoice template.
-    """
-    result = await db.execute(select(InvoiceTemplateModel).filter(InvoiceTemplateModel.is_system_default == True))
-    return result.scalars().first()
+    Served from a short-lived process-wide cache; the cached row is merged into `db` on return.
+    """
+    async def load() -> Optional[InvoiceTemplateModel]:
+        result = await db.execute(select(InvoiceTemplateModel).filter(InvoiceTemplateModel.is_system_default == True))
+        template = result.scalars().first()
+        if template is not None:
+            # Cache a detached instance so changes made through a session never reach it
+            db.expunge(template)
+        return template
+
+    template = await _system_default_cache.get_or_load(_SYSTEM_DEFAULT_CACHE_KEY, load)
+    if template is None:
+        return None
+    return await db.merge(template, load=False)
 
 async def get_all_invoice_templates(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[InvoiceTemplateModel]:
     """
     Get a list of all invoice templates with pagination, ordered by order_index then name.
     """
     result = await db.execute(
-        select(InvoiceTemplateModel)
-        .order_by(InvoiceTemplateModel.order_index, InvoiceTemplateModel.name)
-        .offset(skip)
-        .limit(limit)
+        lambda_stmt(
+            lambda: select(InvoiceTemplateModel)
+            .order_by(InvoiceTemplateModel.order_index, InvoiceTemplateModel.name)
+            .offset(skip)
+            .limit(limit)
+        )
     )
     return result.scalars().all()
 
+async def _unset_other_system_defaults(
+    db: AsyncSession, keep_template_id: Optional[uuid.UUID] = None
+) -> List[uuid.UUID]:
+    """
+    Clears is_system_default on every default template except keep_template_id in a single
+    UPDATE ... RETURNING, and returns the IDs that were unset (normally zero or one).
+    """
+    stmt = (
+        sqlalchemy_update(InvoiceTemplateModel)
+        .where(InvoiceTemplateModel.is_system_default == True)
+        .values(is_system_default=False)
+        .returning(InvoiceTemplateModel.id)
+    )
+    if keep_template_id is not None:
+        stmt = stmt.where(InvoiceTemplateModel.id != keep_template_id) # Don't unset itself
+    result = await db.execute(stmt)
+    unset_ids = result.scalars().all()
+    if unset_ids:
+        _system_default_cache.clear_on_commit(db.sync_session) # Bulk UPDATEs don't fire the mapper events
+    if len(unset_ids) > 1:
+        print(f"Warning: Found {len(unset_ids)} system default templates; all of them were unset: {unset_ids}")
+    return unset_ids
+
 async def create_invoice_template(db: AsyncSession, *, template_in: InvoiceTemplateCreate) -> InvoiceTemplateModel:
     """
     Create a new invoice template.
@@ -55,11 +105,7 @@ async def create_invoice_template(db: AsyncSession, *, template_in: InvoiceTempl
     """
     if template_in.is_system_default:
         # Unset any other system default template
-        await db.execute(
-            sqlalchemy_update(InvoiceTemplateModel)
-            .where(InvoiceTemplateModel.is_system_default == True)
-            .values(is_system_default=False)
-        )
+        await _unset_other_system_defaults(db)
 
     db_obj_data = template_in.model_dump(exclude_unset=True)
     db_obj = InvoiceTemplateModel(**db_obj_data)
@@ -80,20 +126,20 @@ async def update_invoice_template(
 
     if update_data.get("is_system_default") is True and not db_obj.is_system_default:
         # If setting this template as default, unset any other default
-        await db.execute(
-            sqlalchemy_update(InvoiceTemplateModel)
-            .where(InvoiceTemplateModel.id != db_obj.id) # Don't unset itself
-            .where(InvoiceTemplateModel.is_system_default == True)
-            .values(is_system_default=False)
-        )
+        await _unset_other_system_defaults(db, keep_template_id=db_obj.id)
     
     # Prevent unsetting the only system default directly through update if it's the only one
     # (This logic might be better placed in an API layer or service layer)
     if update_data.get("is_system_default") is False and db_obj.is_system_default:
-        count_query = select(func.count(InvoiceTemplateModel.id)).filter(InvoiceTemplateModel.is_system_default == True)
-        count_result = await db.execute(count_query)
-        default_count = count_result.scalar_one_or_none() or 0
-        if default_count <= 1:
+        # EXISTS stops at the first other default instead of counting all of them
+        other_default_query = select(
+            exists().where(
+                InvoiceTemplateModel.is_system_default == True,
+                InvoiceTemplateModel.id != db_obj.id
+            )
+        )
+        another_default_exists = (await db.execute(other_default_query)).scalar()
+        if not another_default_exists:
             # Don't allow unsetting the last system default via a simple update
             # A dedicated endpoint or admin action should handle changing the default.
             # Or, the logic should ensure another is set as default first.
@@ -103,12 +149,21 @@ async def update_invoice_template(
                 print(f"Warning: Attempted to unset the only system default template (ID: {db_obj.id}). Change ignored.")
 
 
-    for field, value in update_data.items():
-        setattr(db_obj, field, value)
-    
-    db.add(db_obj) # Add db_obj to the session if it's not already there or if it's been modified.
+    if not update_data:
+        await db.commit() # Still persist any default-template unset issued above
+        return db_obj
+
+    # Write and read back in one UPDATE ... RETURNING; the returned row refreshes db_obj in place
+    result = await db.execute(
+        sqlalchemy_update(InvoiceTemplateModel)
+        .where(InvoiceTemplateModel.id == db_obj.id)
+        .values(**update_data)
+        .returning(InvoiceTemplateModel)
+        .execution_options(synchronize_session="fetch")
+    )
+    db_obj = result.scalar_one()
+    _system_default_cache.clear_on_commit(db.sync_session) # Bulk UPDATEs don't fire the mapper events
     await db.commit()
-    await db.refresh(db_obj)
     return db_obj
 
 async def delete_invoice_template(db: AsyncSession, *, db_obj: InvoiceTemplateModel) -> InvoiceTemplateModel:
@@ -1,30 +1,43 @@
 # backend/app/crud/crud_item.py
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload # For eager loading
-from sqlalchemy import func # For func.max
+from sqlalchemy.orm import aliased, joinedload, raiseload # Eager load what callers need; raise on anything else
+from sqlalchemy import Row, bindparam, delete, exists, func, insert, or_, update as sqlalchemy_update # func.max / func.lower; INSERT/DELETE ... RETURNING for images
+import logging
 import uuid
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 
 from app.models.item import Item as ItemModel
 from app.models.item_image import ItemImage as ItemImageModel
 from app.schemas.item import ItemCreate, ItemUpdate # ItemImageCreate not directly used here for file uploads
 
+logger = logging.getLogger(__name__)
+
+# Built once at import; each call only binds its parameters.
+# Single-item fetches join the (few) images in the same round-trip.
+_GET_ITEM = (
+    select(ItemModel)
+    .options(joinedload(ItemModel.images), raiseload("*"))
+    .where(ItemModel.id == bindparam("item_id"))
+)
+_GET_ITEM_BY_NAME_FOR_ORG = (
+    select(ItemModel)
+    .options(raiseload("*")) # Callers serialize via schemas.Item, which has no images
+    .where(ItemModel.organization_id == bindparam("organization_id"))
+    .where(func.lower(ItemModel.name) == bindparam("lower_name")) # Matches ix_items_org_lower_name
+)
+
 async def get_item(db: AsyncSession, item_id: uuid.UUID) -> Optional[ItemModel]:
-    print(f"DEBUG (crud.item.get_item): Fetching item ID {item_id} with image eager load.")
-    result = await db.execute(
-        select(ItemModel)
-        .options(selectinload(ItemModel.images))
-        .filter(ItemModel.id == item_id)
-    )
-    item = result.scalars().first()
-    if item:
-        print(f"DEBUG (crud.item.get_item): Fetched item. Name: {item.name}, Number of images loaded: {len(item.images) if item.images else 0}")
-        if item.images:
-            for idx, img_obj in enumerate(item.images):
-                print(f"  Image {idx}: ID={img_obj.id}, URL={img_obj.image_url}, Order={img_obj.order_index}")
-    else:
-        print(f"DEBUG (crud.item.get_item): Item ID {item_id} not found.")
+    logger.debug("get_item: fetching item %s with image eager load", item_id)
+    result = await db.execute(_GET_ITEM, {"item_id": item_id})
+    item = result.unique().scalars().first() # unique(): joined collection rows
+    if logger.isEnabledFor(logging.DEBUG): # Skip the per-image loop entirely unless debugging
+        if item:
+            logger.debug("get_item: fetched item %r with %d image(s)", item.name, len(item.images) if item.images else 0)
+            for idx, img_obj in enumerate(item.images or []):
+                logger.debug("  image %d: id=%s url=%s order=%s", idx, img_obj.id, img_obj.image_url, img_obj.order_index)
+        else:
+            logger.debug("get_item: item %s not found", item_id)
     return item
 
 
@@ -35,35 +48,62 @@ async def get_item_by_name_for_org(
     Get an item by name within a specific organization.
     """
     result = await db.execute(
-        select(ItemModel)
-        .filter(ItemModel.name.ilike(name))
-        .filter(ItemModel.organization_id == organization_id)
+        _GET_ITEM_BY_NAME_FOR_ORG, {"organization_id": organization_id, "lower_name": name.lower()}
     )
     return result.scalars().first()
 
-async def get_items_by_organization(
+async def item_name_exists_for_org(
+    db: AsyncSession, *, name: str, organization_id: uuid.UUID, exclude_id: Optional[uuid.UUID] = None
+) -> bool:
+    """
+    Check whether an item with this name (case-insensitive) exists in the organization,
+    optionally ignoring one item. Runs SELECT EXISTS instead of loading the item.
+    """
+    criteria = [
+        ItemModel.organization_id == organization_id,
+        func.lower(ItemModel.name) == name.lower(), # Matches ix_items_org_lower_name
+    ]
+    if exclude_id is not None:
+        criteria.append(ItemModel.id != exclude_id)
+    return bool(await db.scalar(select(exists().where(*criteria))))
+
+async def get_item_summaries_by_organization(
     db: AsyncSession, *, organization_id: uuid.UUID, skip: int = 0, limit: int = 100, search: Optional[str] = None
-) -> List[ItemModel]:
+) -> Sequence[Row]:
     """
-    Get a list of items for a specific organization, eagerly loading images.
+    Get a page of item summaries for a specific organization: the ItemSummary columns plus the
+    URL of the first image (lowest order_index), as plain rows rather than ORM instances.
     Optionally filters by search term in item name.
     """
+    primary_image_url = (
+        select(ItemImageModel.image_url)
+        .where(ItemImageModel.item_id == ItemModel.id)
+        .order_by(ItemImageModel.order_index)
+        .limit(1)
+        .scalar_subquery()
+        .label("primary_image_url")
+    )
     query = (
-        select(ItemModel)
-        .options(selectinload(ItemModel.images)) # Eager load images
+        select(
+            ItemModel.id,
+            ItemModel.name,
+            ItemModel.description,
+            ItemModel.default_price,
+            ItemModel.default_unit,
+            primary_image_url,
+        )
         .filter(ItemModel.organization_id == organization_id)
     )
     if search:
-        query = query.filter(ItemModel.name.ilike(f"%{search}%"))
+        # Substring OR trigram-similar names (typos, word order); both operators are served by
+        # ix_items_name_trgm, and the organization_id filter combines with it via a bitmap AND.
+        query = query.filter(
+            or_(ItemModel.name.ilike(f"%{search}%"), ItemModel.name.op("%")(search))
+        ).order_by(func.similarity(ItemModel.name, search).desc())
     
     query = query.order_by(ItemModel.name).offset(skip).limit(limit)
     result = await db.execute(query)
-    items = result.scalars().all()
-    # Optional: If images are always needed in a specific order for all items
-    # for item in items:
-    #     if item.images:
-    #         item.images.sort(key=lambda img: img.order_index)
-    return items
+    return result.all()
 
 async def create_item(
     db: AsyncSession, *, item_in: ItemCreate 
@@ -72,18 +112,18 @@ async def create_item(
     Create a new item. item_in no longer contains image_url directly.
     Images are handled by a separate upload endpoint and ItemImageModel.
     """
-    print(f"\n--- DEBUG (crud_item.create_item): Creating item with payload: {item_in.model_dump()} ---")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("create_item: creating item with payload %s", item_in.model_dump())
     # image_url is removed from ItemCreate schema and ItemModel's direct attributes
-    db_obj_data = item_in.model_dump(exclude_unset=True)
-    db_obj = ItemModel(**db_obj_data)
+    # Set fields read straight off the schema; it is flat, so model_dump's serializer pass buys nothing
+    db_obj_data = {f: getattr(item_in, f) for f in item_in.model_fields_set}
+    # A brand-new item has no images: start the collection loaded and empty instead of
+    # refreshing it from the DB. No server-side defaults either, so no refresh is needed.
+    db_obj = ItemModel(**db_obj_data, images=[])
     
     db.add(db_obj)
-    await db.commit()
-    await db.refresh(db_obj)
-    # Eager load images relationship, though it will be empty for a new item
-    # This ensures the 'images' attribute is populated (as an empty list).
-    await db.refresh(db_obj, attribute_names=['images']) 
-    print(f"--- DEBUG (crud_item.create_item): Created item ID: {db_obj.id} (Images list will be empty initially) ---\n")
+    await db.flush()
+    logger.debug("create_item: created item %s", db_obj.id)
     return db_obj
 
 async def update_item(
@@ -92,41 +132,44 @@ async def update_item(
     """
     Update an existing item's non-image fields.
     Images are managed via separate endpoints and ItemImageModel.
+    Raises ValueError if the new name is already used by another item in the organization.
     """
-    print(f"\n--- DEBUG (crud_item.update_item): Updating Item ID: {db_obj.id} ---")
+    logger.debug("update_item: updating item %s", db_obj.id)
     # image_url is removed from ItemUpdate schema
-    update_data = obj_in.model_dump(exclude_unset=True) 
-    print(f"DEBUG (crud_item.update_item): update_data received: {update_data}")
+    update_data = {f: getattr(obj_in, f) for f in obj_in.model_fields_set}
+    logger.debug("update_item: update_data received: %s", update_data)
 
-    # If name is being updated, check for duplicates within the same organization
     if "name" in update_data and update_data["name"] != db_obj.name:
-        print(f"DEBUG (crud_item.update_item): Name change detected. Old: '{db_obj.name}', New: '{update_data['name']}'")
-        existing_item = await get_item_by_name_for_org(
-            db,
-            name=update_data["name"],
-            organization_id=db_obj.organization_id 
+        # Rename: the duplicate-name check rides along in the UPDATE itself instead of a
+        # separate SELECT first. No row back means another item already has the name.
+        logger.debug("update_item: name change detected %r -> %r", db_obj.name, update_data["name"])
+        other_item = aliased(ItemModel)
+        result = await db.execute(
+            sqlalchemy_update(ItemModel)
+            .where(
+                ItemModel.id == db_obj.id,
+                ~exists().where(
+                    other_item.organization_id == db_obj.organization_id,
+                    func.lower(other_item.name) == update_data["name"].lower(),
+                    other_item.id != db_obj.id,
+                ),
+            )
+            .values(**update_data)
+            .returning(ItemModel)
+            .execution_options(synchronize_session="fetch") # Applies the new values to db_obj
         )
-        if existing_item and existing_item.id != db_obj.id:
-            print(f"ERROR (crud_item.update_item): Attempt to update item name to an existing one ('{update_data['name']}') for org {db_obj.organization_id}. Name update potentially skipped or will cause DB error.")
-            # Consider raising an exception here to be caught by the API layer
-            # e.g., raise ValueError(f"Item name '{update_data['name']}' already exists in this organization.")
-            # For now, it just prints an error. The DB constraint might catch it.
-
-    for field, value in update_data.items():
-        # No HttpUrl conversion needed here as image_url is removed from ItemUpdate schema
-        print(f"DEBUG (crud_item.update_item): Setting field '{field}' to value '{value}' (type: {type(value)}) on Item ID {db_obj.id}")
-        setattr(db_obj, field, value)
-    
-    print(f"DEBUG (crud_item.update_item): All non-image fields after setattr loop (BEFORE commit): name='{db_obj.name}', desc='{db_obj.description}', price='{db_obj.default_price}', unit='{db_obj.default_unit}'")
+        if result.scalar_one_or_none() is None:
+            raise ValueError(f"Item name '{update_data['name']}' already exists in this organization.")
+    else:
+        for field, value in update_data.items():
+            # No HttpUrl conversion needed here as image_url is removed from ItemUpdate schema
+            setattr(db_obj, field, value)
 
-    await db.commit()
-    print(f"DEBUG (crud_item.update_item): After db.commit() for Item ID: {db_obj.id}")
+    await db.flush()
     
-    await db.refresh(db_obj)
-    # Ensure the 'images' attribute is also refreshed/loaded, even if not directly modified by this function.
-    await db.refresh(db_obj, attribute_names=['images']) 
-    print(f"DEBUG (crud_item.update_item): All fields after refresh: name='{db_obj.name}', desc='{db_obj.description}', price='{db_obj.default_price}', unit='{db_obj.default_unit}'")
-    print(f"--- DEBUG (crud_item.update_item): Exiting for Item ID: {db_obj.id} ---\n")
+    # No refresh: the new values are already on db_obj and images
+    # were loaded by get_item; items have no server-side defaults to read back.
+    logger.debug("update_item: updated item %s", db_obj.id)
     return db_obj
 
 async def delete_item(db: AsyncSession, *, db_obj: ItemModel) -> ItemModel:
@@ -135,60 +178,50 @@ async def delete_item(db: AsyncSession, *, db_obj: ItemModel) -> ItemModel:
     if the relationship is configured with "all, delete-orphan".
     Physical file deletion from storage needs to be handled separately (e.g., in the API endpoint or a background job).
     """
-    print(f"\n--- DEBUG (crud_item.delete_item): Deleting Item ID: {db_obj.id}, Name: {db_obj.name} ---")
+    logger.debug("delete_item: deleting item %s (%r)", db_obj.id, db_obj.name)
     # The actual file deletion from disk/S3 should be handled in the API endpoint
     # before or after this database operation.
     
     await db.delete(db_obj) # This should cascade to ItemImage records if relationship is set up with cascade="all, delete-orphan"
-    await db.commit()
-    print(f"--- DEBUG (crud_item.delete_item): Deleted Item (and its image records via cascade if configured) ID: {db_obj.id} ---\n")
-    # db_obj is now detached and likely expired. Returning it might not be useful 
+    await db.flush()
+    logger.debug("delete_item: deleted item %s and its image records", db_obj.id)
+    # db_obj is now marked deleted (detached once the request commits). Returning it might not be useful 
     # unless you capture its state before deletion for some reason.
     # For typical DELETE operations, often no object or a success status is returned from the CRUD layer.
     return db_obj 
 
 # --- New CRUD functions for ItemImage ---
-async def add_image_to_item(
-    db: AsyncSession, *, item_id: uuid.UUID, image_url: str, order_index: Optional[int] = None, alt_text: Optional[str] = None
-) -> ItemImageModel:
-    """
-    Adds an image record to an item.
-    If order_index is None or not provided, it will be set to the next available index.
-    """
-    print(f"DEBUG (crud_item.add_image_to_item): Adding image '{image_url}' to item ID {item_id} with order {order_index}, alt_text: {alt_text}")
-    
-    final_order_index = order_index
-    if final_order_index is None:
-        current_max_order = await db.execute(
-            select(func.max(ItemImageModel.order_index)).filter(ItemImageModel.item_id == item_id)
-        )
-        max_idx = current_max_order.scalar_one_or_none()
-        final_order_index = (max_idx + 1) if max_idx is not None else 0
-        print(f"DEBUG (crud_item.add_image_to_item): Auto-calculated order_index: {final_order_index}")
-
-    db_image = ItemImageModel(
-        item_id=item_id, 
-        image_url=image_url, 
-        order_index=final_order_index,
-        alt_text=alt_text
+async def add_images_to_item(
+    db: AsyncSession, *, item_id: uuid.UUID, images: List[Tuple[str, Optional[str]]]
+) -> List[ItemImageModel]:
+    """
+    Adds several image records to an item in one batched INSERT ... RETURNING.
+    'images' is a list of (image_url, alt_text) pairs; they are appended after the item's current images.
+    """
+    if not images:
+        return []
+    logger.debug("add_images_to_item: adding %d image(s) to item %s", len(images), item_id)
+    base_order_index = await db.scalar(
+        select(func.coalesce(func.max(ItemImageModel.order_index) + 1, 0))
+        .where(ItemImageModel.item_id == item_id)
     )
-    db.add(db_image)
-    await db.commit()
-    await db.refresh(db_image)
-    print(f"DEBUG (crud_item.add_image_to_item): Added image record ID {db_image.id}, URL: {db_image.image_url}, Order: {db_image.order_index}")
-    return db_image
+    rows = [
+        {"item_id": item_id, "image_url": image_url, "alt_text": alt_text, "order_index": base_order_index + i}
+        for i, (image_url, alt_text) in enumerate(images)
+    ]
+    result = await db.scalars(insert(ItemImageModel).returning(ItemImageModel), rows)
+    db_images = result.all()
+    await db.flush()
+    logger.debug("add_images_to_item: added images %s", [img.id for img in db_images])
+    return db_images
 
 async def get_item_image(db: AsyncSession, image_id: uuid.UUID) -> Optional[ItemImageModel]:
     """
     Get a single item image by its ID.
     """
-    print(f"DEBUG (crud_item.get_item_image): Fetching ItemImage record ID: {image_id}")
     result = await db.execute(select(ItemImageModel).filter(ItemImageModel.id == image_id))
     image = result.scalars().first()
-    if image:
-        print(f"DEBUG (crud_item.get_item_image): Found ItemImage: {image.id}, URL: {image.image_url}")
-    else:
-        print(f"DEBUG (crud_item.get_item_image): ItemImage record ID: {image_id} not found.")
+    logger.debug("get_item_image: image %s %s", image_id, "found" if image else "not found")
     return image
 
 async def delete_item_image_record(db: AsyncSession, image_id: uuid.UUID) -> Optional[ItemImageModel]:
@@ -196,14 +229,15 @@ async def delete_item_image_record(db: AsyncSession, image_id: uuid.UUID) -> Opt
     Delete an ItemImage record from the database.
     Physical file deletion from storage needs to be handled separately.
     """
-    db_image = await get_item_image(db, image_id=image_id) # Reuse get_item_image
-    if db_image:
-        print(f"DEBUG (crud_item.delete_item_image_record): Deleting ItemImage record ID: {db_image.id}, URL: {db_image.image_url}")
-        # Physical file deletion should be handled in the API endpoint.
-        await db.delete(db_image)
-        await db.commit()
-        print(f"DEBUG (crud_item.delete_item_image_record): Deleted ItemImage record from DB.")
-        return db_image # Return the (now deleted) object state before deletion
-    else:
-        print(f"DEBUG (crud_item.delete_item_image_record): ItemImage record ID: {image_id} not found for deletion.")
-        return None
\ No newline at end of file
+    # One DELETE ... RETURNING instead of SELECT then DELETE
+    result = await db.execute(
+        delete(ItemImageModel).where(ItemImageModel.id == image_id).returning(ItemImageModel)
+    )
+    db_image = result.scalar_one_or_none()
+    if db_image is None:
+        logger.debug("delete_item_image_record: image %s not found for deletion", image_id)
+        return None
+    # Physical file deletion should be handled in the API endpoint.
+    await db.flush()
+    logger.debug("delete_item_image_record: deleted image %s (%s)", db_image.id, db_image.image_url)
+    return db_image # Return the (now deleted) object state before deletion
\ No newline at end of file
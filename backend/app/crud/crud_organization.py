@@ -1,31 +1,88 @@
 from __future__ import annotations
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import bindparam, event
 from sqlalchemy.future import select
-# from sqlalchemy.orm import selectinload # For eager loading related data if needed later
+from sqlalchemy.orm import object_session, raiseload
 import uuid
 from typing import Optional
-from pydantic import HttpUrl
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.db.cache import ProcessCache
 from app.models.organization import Organization as OrganizationModel
+from app.models.invoice_template import InvoiceTemplate as InvoiceTemplateModel
 from app.models.user import User as UserModel # Import User model
 from app.schemas.organization import OrganizationCreate, OrganizationUpdate
 
+# Nothing beyond the columns is loaded here: list, lookup and ownership checks never read
+# relationships. Responses built from the Organization schema, which includes the selected
+# template, opt in through load_selected_invoice_template.
+_ORGANIZATION_LOAD_OPTIONS = (raiseload("*"),)
+
+# Built once at import; each call only binds its parameters
+_GET_ORGANIZATION = (
+    select(OrganizationModel)
+    .options(*_ORGANIZATION_LOAD_OPTIONS)
+    .where(OrganizationModel.id == bindparam("org_id"))
+)
+_GET_ORGANIZATION_BY_NAME_FOR_USER = (
+    select(OrganizationModel)
+    .options(*_ORGANIZATION_LOAD_OPTIONS)
+    .where(OrganizationModel.name == bindparam("name"))
+    .where(OrganizationModel.user_id == bindparam("user_id"))
+)
+
+# Process-wide cache for get_organization, which nearly every organization-scoped request
+# hits through deps.get_valid_organization_for_user. Entries are detached instances kept for
+# a minute and dropped when the organization (or its user) is written, and again when that
+# write's transaction ends.
+_organization_cache = ProcessCache(maxsize=1024, ttl=60)
+
+def _invalidate_cached_organization(_mapper, _connection, target: OrganizationModel) -> None:
+    _organization_cache.discard_on_commit(object_session(target), target.id)
+
+def _clear_organization_cache(_mapper, _connection, target: UserModel) -> None:
+    _organization_cache.clear_on_commit(object_session(target))
+
+for _event_name in ("after_update", "after_delete"):
+    event.listen(OrganizationModel, _event_name, _invalidate_cached_organization)
+# A user's organizations are removed by ON DELETE CASCADE without passing through the ORM
+event.listen(UserModel, "after_delete", _clear_organization_cache)
+
 async def get_organization(db: AsyncSession, org_id: uuid.UUID) -> Optional[OrganizationModel]:
     """
     Get a single organization by its ID.
+    Served from a short-lived process-wide cache; the cached row is merged into `db` on return.
     """
-    result = await db.execute(select(OrganizationModel).filter(OrganizationModel.id == org_id))
-    return result.scalars().first()
+    async def load() -> Optional[OrganizationModel]:
+        result = await db.execute(_GET_ORGANIZATION, {"org_id": org_id})
+        organization = result.scalars().first()
+        if organization is not None:
+            # Cache a detached instance so changes made through a session never reach it
+            db.expunge(organization)
+        return organization
+
+    # Concurrent misses on this id share one query; other ids don't wait on it
+    organization = await _organization_cache.get_or_load(org_id, load)
+    if organization is None:
+        return None
+    return await db.merge(organization, load=False)
+
+async def load_selected_invoice_template(db: AsyncSession, organization: OrganizationModel) -> OrganizationModel:
+    """
+    Populate organization.selected_invoice_template for responses built from the Organization schema.
+    The template is fetched by primary key, so one already in the session costs no query.
+    """
+    template = None
+    if organization.selected_invoice_template_id is not None:
+        template = await db.get(InvoiceTemplateModel, organization.selected_invoice_template_id)
+    set_committed_value(organization, "selected_invoice_template", template)
+    return organization
 
 async def get_organization_by_name_for_user(db: AsyncSession, name: str, user_id: uuid.UUID) -> Optional[OrganizationModel]:
     """
     Get a single organization by its name for a specific user.
     """
-    result = await db.execute(
-        select(OrganizationModel)
-        .filter(OrganizationModel.name == name)
-        .filter(OrganizationModel.user_id == user_id)
-    )
+    result = await db.execute(_GET_ORGANIZATION_BY_NAME_FOR_USER, {"name": name, "user_id": user_id})
     return result.scalars().first()
 
 async def get_organizations_by_user(db: AsyncSession, user_id: uuid.UUID, skip: int = 0, limit: int = 100) -> list[OrganizationModel]:
@@ -34,6 +91,7 @@ async def get_organizations_by_user(db: AsyncSession, user_id: uuid.UUID, skip:
     """
     result = await db.execute(
         select(OrganizationModel)
+        .options(*_ORGANIZATION_LOAD_OPTIONS)
         .filter(OrganizationModel.user_id == user_id)
         .offset(skip)
         .limit(limit)
@@ -46,19 +104,13 @@ async def create_organization(
     """
     Create a new organization for a specific owner.
     """
-    # Pydantic v2: db_obj_data = org_in.model_dump(exclude_unset=True)
-    # Pydantic v1: db_obj_data = org_in.dict(exclude_unset=True)
-    db_obj_data = org_in.model_dump(exclude_unset=True)
-
-    if 'logo_url' in db_obj_data and isinstance(db_obj_data['logo_url'], HttpUrl):
-        db_obj_data['logo_url'] = str(db_obj_data['logo_url'])
-
+    db_obj_data = {f: getattr(org_in, f) for f in org_in.model_fields_set}
     db_obj = OrganizationModel(**db_obj_data, user_id=owner_id) # <--- SET user_id here
 
     db.add(db_obj)
-    await db.commit()
-    await db.refresh(db_obj)
-    return db_obj
+    await db.flush()
+    # Columns stay loaded after the flush; only the template relationship needs loading
+    return await load_selected_invoice_template(db, db_obj)
 
 async def update_organization(
     db: AsyncSession, *, db_obj: OrganizationModel, obj_in: OrganizationUpdate
@@ -68,27 +120,20 @@ async def update_organization(
     'db_obj' is the existing organization model instance from the database.
     'obj_in' is a Pydantic schema with the update data.
     """
-    # Pydantic v2: update_data = obj_in.model_dump(exclude_unset=True)
-    # Pydantic v1: update_data = obj_in.dict(exclude_unset=True)
-    update_data = obj_in.model_dump(exclude_unset=True)
+    update_data = {f: getattr(obj_in, f) for f in obj_in.model_fields_set}
 
     for field, value in update_data.items():
-        if isinstance(value, HttpUrl): # Check if the value is an HttpUrl instance
-            setattr(db_obj, field, str(value)) # Convert it to string
-        else:
-            setattr(db_obj, field, value)
+        setattr(db_obj, field, value) # logo_url is a plain str in the schemas, nothing to convert
 
-    db.add(db_obj) # or await db.merge(db_obj) if db_obj could be detached
-    await db.commit()
-    await db.refresh(db_obj)
-    return db_obj
+    await db.flush() # db_obj is attached; only the setattr changes need writing
+    return await load_selected_invoice_template(db, db_obj)
 
 async def delete_organization(db: AsyncSession, *, db_obj: OrganizationModel) -> OrganizationModel:
     """
     Delete an organization.
     """
     await db.delete(db_obj)
-    await db.commit()
-    # After deletion, the object is no longer in the session.
+    await db.flush()
+    # After the request commits, the object is no longer in the session.
     # Returning the object as it was before deletion for confirmation.
     return db_obj
\ No newline at end of file
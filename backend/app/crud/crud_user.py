@@ -1,43 +1,118 @@
 from __future__ import annotations
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import bindparam, event
 from sqlalchemy.future import select
+from sqlalchemy.orm import object_session, raiseload
+import asyncio
+import os
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from app.db.cache import ProcessCache
 from app.models.user import User as UserModel # Alias to avoid name clash
 from app.schemas.user import UserCreate, UserUpdate
 from app.core.security import get_password_hash, verify_password # Our security utils
-from typing import Optional
+from typing import Dict, Optional
 
 
+# bcrypt is CPU-bound (tens of ms per call); run it off the event loop so a login doesn't stall other requests
+_PW_POOL = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="password-hash")
+
+async def _hash_password(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(_PW_POOL, get_password_hash, password)
+
+async def _verify_password(password: str, hashed_password: str) -> bool:
+    return await asyncio.get_running_loop().run_in_executor(_PW_POOL, verify_password, password, hashed_password)
+
+# Per-request memo for get_user/get_user_by_email; scoped by the deps.user_cache_scope router dependency
+_user_cache: ContextVar[Optional[Dict[tuple, UserModel]]] = ContextVar("user_cache", default=None)
+
+def reset_user_cache() -> None:
+    """Starts an empty user memo for the current request context."""
+    _user_cache.set({})
+
+def clear_user_cache() -> None:
+    """Drops the user memo of the current request context."""
+    _user_cache.set(None)
+
+# Process-wide cache behind the per-request memo for get_user (the JWT -> current user lookup).
+# Entries are detached instances dropped whenever the user is written and again once that write
+# commits, but only in the process that wrote it: other workers keep serving the old row (e.g. a
+# deactivated user's is_active) until its TTL runs out, so the TTL is kept short to bound that window.
+_user_by_id_cache = ProcessCache(maxsize=1024, ttl=10)
+
+def _invalidate_cached_user(_mapper, _connection, target: UserModel) -> None:
+    _user_by_id_cache.discard_on_commit(object_session(target), target.id)
+
+for _event_name in ("after_update", "after_delete"):
+    event.listen(UserModel, _event_name, _invalidate_cached_user)
+
+# Built once at import; each call only binds its parameter
+_GET_USER_BY_ID = select(UserModel).options(raiseload("*")).where(UserModel.id == bindparam("user_id"))
+_GET_USER_BY_EMAIL = select(UserModel).options(raiseload("*")).where(UserModel.email == bindparam("email"))
+
+def _remember_user(user: UserModel) -> None:
+    cache = _user_cache.get()
+    if cache is not None:
+        cache[("user", user.id)] = user
+        cache[("user_by_email", user.email)] = user
+
+def _forget_user(user: UserModel, *emails: str) -> None:
+    cache = _user_cache.get()
+    if cache is not None:
+        cache.pop(("user", user.id), None)
+        for email in (user.email, *emails):
+            cache.pop(("user_by_email", email), None)
+
 async def get_user(db: AsyncSession, user_id: uuid.UUID) -> Optional[UserModel]:
     """
     Get a user by their ID.
     """
-    result = await db.execute(select(UserModel).filter(UserModel.id == user_id))
-    return result.scalars().first()
+    cache = _user_cache.get()
+    if cache is not None and ("user", user_id) in cache:
+        return cache[("user", user_id)]
+
+    async def load() -> Optional[UserModel]:
+        result = await db.execute(_GET_USER_BY_ID, {"user_id": user_id})
+        user = result.scalars().first()
+        if user is not None:
+            # Cache a detached instance so changes made through a session never reach it
+            db.expunge(user)
+        return user
+
+    # Concurrent misses on this id share one query; other ids don't wait on it
+    user = await _user_by_id_cache.get_or_load(user_id, load)
+    if user is None:
+        return None
+    user = await db.merge(user, load=False)
+    _remember_user(user)
+    return user
 
 async def get_user_by_email(db: AsyncSession, email: str) -> Optional[UserModel]:
     """
     Get a user by their email address.
     """
-    result = await db.execute(select(UserModel).filter(UserModel.email == email))
-    return result.scalars().first()
+    cache = _user_cache.get()
+    if cache is not None and ("user_by_email", email) in cache:
+        return cache[("user_by_email", email)]
+    result = await db.execute(_GET_USER_BY_EMAIL, {"email": email})
+    user = result.scalars().first()
+    if user:
+        _remember_user(user)
+    return user
 
 async def create_user(db: AsyncSession, *, user_in: UserCreate) -> UserModel:
     """
     Create a new user.
     """
-    hashed_password = get_password_hash(user_in.password)
+    hashed_password = await _hash_password(user_in.password)
     # Create a dictionary for UserModel, excluding the plain password
     # and adding the hashed_password.
-    # Pydantic v2: user_data_for_db = user_in.model_dump(exclude={'password'})
-    # Pydantic v1: user_data_for_db = user_in.dict(exclude={'password'})
-
-    db_obj_data = user_in.model_dump(exclude={'password'})
+    db_obj_data = {f: getattr(user_in, f) for f in UserCreate.model_fields if f != "password"}
     db_obj = UserModel(**db_obj_data, hashed_password=hashed_password)
     
     db.add(db_obj)
-    await db.commit()
-    await db.refresh(db_obj)
+    await db.flush() # No server-side defaults: no refresh needed
     return db_obj
 
 async def update_user(
@@ -48,13 +123,11 @@ async def update_user(
     'db_obj' is the existing user model instance.
     'obj_in' is a Pydantic schema with the update data.
     """
-    # Pydantic v2: update_data = obj_in.model_dump(exclude_unset=True)
-    # Pydantic v1: update_data = obj_in.dict(exclude_unset=True)
-    update_data = obj_in.model_dump(exclude_unset=True)
+    update_data = {f: getattr(obj_in, f) for f in obj_in.model_fields_set}
 
     if "password" in update_data and update_data["password"]:
         # If password is being updated, hash the new one
-        hashed_password = get_password_hash(update_data["password"])
+        hashed_password = await _hash_password(update_data["password"])
         update_data["hashed_password"] = hashed_password
         del update_data["password"] # Don't store plain password
     
@@ -72,12 +145,12 @@ async def update_user(
             del update_data["email"] # Or raise ValueError("Email already registered by another user.")
 
 
+    previous_email = db_obj.email
     for field, value in update_data.items():
         setattr(db_obj, field, value)
     
-    db.add(db_obj)
-    await db.commit()
-    await db.refresh(db_obj)
+    await db.flush()
+    _forget_user(db_obj, previous_email)
     return db_obj
 
 async def authenticate_user(
@@ -92,7 +165,7 @@ async def authenticate_user(
         return None
     if not user.is_active: # Optional: check if user is active
         return None # Or raise a specific exception/error code
-    if not verify_password(password, user.hashed_password):
+    if not await _verify_password(password, user.hashed_password):
         return None
     return user
 
@@ -105,8 +178,9 @@ async def delete_user(db: AsyncSession, *, user_to_delete: UserModel) -> UserMod
     """
     # The user_to_delete object is already fetched and verified by the API layer
     await db.delete(user_to_delete)
-    await db.commit()
-    # The object is now detached from the session and effectively deleted from DB.
+    await db.flush()
+    _forget_user(user_to_delete)
+    # The object is deleted from the DB once the request's transaction commits.
     # Returning it might be for logging or confirmation, but its relationships might be stale.
     return user_to_delete
 
@@ -1,11 +1,12 @@
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.ext.declarative import declared_attr
 from typing import Any
 
 class CustomBase:
-    # Generate __tablename__ automatically
-    @declared_attr
-    def __tablename__(cls) -> str:
-        return cls.__name__.lower() + "s"
+    # Generate __tablename__ automatically, once per class, as a plain class attribute
+    # (a declared_attr would recompute the string on every access)
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        if "__tablename__" not in cls.__dict__:
+            cls.__tablename__ = cls.__name__.lower() + "s"
+        super().__init_subclass__(**kwargs)
 
-Base: Any = declarative_base(cls=CustomBase)
\ No newline at end of file
+Base: Any = declarative_base(cls=CustomBase)
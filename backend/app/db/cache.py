@@ -0,0 +1,93 @@
+# backend/app/db/cache.py
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+
+from cachetools import TTLCache
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_MISSING = object()
+_PENDING_INVALIDATIONS = "pending_cache_invalidations" # Key in Session.info
+
+
+class ProcessCache:
+    """
+    Process-wide TTL cache shared by all requests, for rows that are read far more often than written.
+
+    - Misses are loaded once per key: a concurrent miss on the same key awaits the load already in
+      flight instead of querying again, while misses on other keys proceed independently.
+    - Invalidation follows the writing transaction (see discard_on_commit / clear_on_commit): mapper
+      events fire at flush, but the request commits later, so an entry is dropped at flush and again
+      once that transaction commits or rolls back. A load that was in flight across an invalidation
+      is returned to its callers but not stored.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, cache_none: bool = False) -> None:
+        self._entries: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._generation = 0 # Bumped by every invalidation
+        self._cache_none = cache_none
+
+    async def get_or_load(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        value = self._entries.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            value = await asyncio.shield(in_flight) # A cancelled waiter must not cancel the shared load
+            if value is _MISSING: # The load failed; try again with this caller's own session
+                return await self.get_or_load(key, load)
+            return value
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        generation = self._generation
+        try:
+            value = await load()
+        except BaseException:
+            future.set_result(_MISSING)
+            raise
+        finally:
+            del self._in_flight[key]
+        if generation == self._generation and (value is not None or self._cache_none):
+            self._entries[key] = value
+        future.set_result(value)
+        return value
+
+    def discard(self, key: Hashable) -> None:
+        self._generation += 1
+        self._entries.pop(key, None)
+
+    def discard_where(self, predicate: Callable[[Any], bool]) -> None:
+        self._generation += 1
+        for key in [k for k in self._entries.keys() if predicate(k)]:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+
+    def discard_on_commit(self, session: Optional[Session], key: Hashable) -> None:
+        invalidate_on_commit(session, self.discard, key)
+
+    def clear_on_commit(self, session: Optional[Session]) -> None:
+        invalidate_on_commit(session, self.clear)
+
+
+def invalidate_on_commit(session: Optional[Session], invalidate: Callable[..., None], *args: Hashable) -> None:
+    """
+    Runs invalidate(*args) now, and again when `session`'s transaction ends. The second run drops
+    anything a concurrent request cached from the old committed row between this flush and the commit,
+    or that this session cached from its own rolled-back writes.
+    """
+    invalidate(*args)
+    if session is not None:
+        pending: Set[Tuple[Callable[..., None], Tuple[Hashable, ...]]] = session.info.setdefault(_PENDING_INVALIDATIONS, set())
+        pending.add((invalidate, args))
+
+def _run_pending_invalidations(session: Session, *_args: Any) -> None:
+    for invalidate, args in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        invalidate(*args)
+
+event.listen(Session, "after_commit", _run_pending_invalidations)
+event.listen(Session, "after_rollback", _run_pending_invalidations)
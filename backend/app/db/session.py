@@ -1,8 +1,9 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+import asyncio
 import logging
-from fastapi import HTTPException # <--- IMPORT HTTPException
+from typing import AsyncGenerator
 import sys # <--- IMPORT SYS for sys.exit() in case of critical failure
 
 logger = logging.getLogger(__name__)
@@ -15,22 +16,32 @@ if not settings.DATABASE_URL:
     # For a critical setup failure like this, we might even exit if the DB is essential
     # sys.exit("Critical Error: DATABASE_URL not configured. Application cannot start properly.")
 else:
-    # Mask password in log
-    display_db_url = settings.DATABASE_URL
-    if settings.POSTGRES_PASSWORD:
-        display_db_url = display_db_url.replace(settings.POSTGRES_PASSWORD, "********")
-    logger.info(f"Attempting to connect to database: {display_db_url}")
+    logger.info(f"Attempting to connect to database: {settings.DATABASE_URL_SAFE}")
 
     try:
         engine = create_async_engine(
             settings.DATABASE_URL,
-            pool_pre_ping=True,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            pool_use_lifo=True, # Reuse the most recent connections so idle extras can be recycled
+            query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+            connect_args={
+                "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+                # Queries here are short OLTP lookups; PostgreSQL's JIT only adds compile time to them
+                "server_settings": {"jit": "off"},
+            },
         )
-        SessionLocal = sessionmaker(
-            autocommit=False,
-            autoflush=False,
+        # A sync QueuePool here would block the event loop while waiting for a connection
+        if not isinstance(engine.pool, AsyncAdaptedQueuePool):
+            logger.error(f"Unexpected connection pool {type(engine.pool).__name__}; expected AsyncAdaptedQueuePool.")
+        else:
+            logger.info(f"Connection pool: size={settings.DB_POOL_SIZE}, max_overflow={settings.DB_MAX_OVERFLOW}")
+        SessionLocal = async_sessionmaker(
             bind=engine,
-            class_=AsyncSession,
+            autoflush=False,
             expire_on_commit=False
         )
         logger.info("Database engine and SessionLocal configured successfully.")
@@ -40,23 +51,53 @@ else:
         # sys.exit(f"Critical Error: Failed to initialize database connection: {e}")
 
 
-async def get_db() -> AsyncSession:
+async def warm_up_pool() -> None:
     """
-    Dependency to get a database session.
-    Ensures the session is closed after the request.
+    Opens DB_POOL_WARM_CONNECTIONS connections concurrently and returns them to the pool,
+    so the first requests after startup don't each pay for connect + auth.
+    A database that isn't reachable yet is logged, not fatal; requests will connect lazily.
     """
-    if not SessionLocal:
-        logger.error("SessionLocal is not initialized. Database connection might have failed during app startup.")
-        # This indicates a severe configuration or runtime issue if SessionLocal is None here.
-        # Raising an HTTPException will stop the request and inform the client.
-        raise HTTPException(
-            status_code=503, # Service Unavailable
-            detail="Database connection is not available."
-        )
+    if engine is None:
+        return
+    count = min(settings.DB_POOL_WARM_CONNECTIONS, settings.DB_POOL_SIZE)
+    if count <= 0:
+        return
+    connections = await asyncio.gather(*(engine.connect() for _ in range(count)), return_exceptions=True)
+    failures = [c for c in connections if isinstance(c, BaseException)]
+    for connection in connections:
+        if not isinstance(connection, BaseException):
+            await connection.close() # Back into the pool, still open
+    if failures:
+        logger.warning(f"Could not pre-open {len(failures)} of {count} database connections: {failures[0]}")
+    else:
+        logger.info(f"Pre-opened {count} database connections.")
 
-    # Type hint db as AsyncSession for better autocompletion and type checking
-    db: AsyncSession = SessionLocal()
-    try:
-        yield db
-    finally:
-        await db.close()
\ No newline at end of file
+async def dispose_engine() -> None:
+    """Closes all pooled connections at shutdown."""
+    if engine is not None:
+        await engine.dispose()
+
+
+def ensure_database_configured() -> None:
+    """
+    Fails fast at startup when the engine/SessionLocal could not be created,
+    so get_db doesn't have to re-check on every request.
+    """
+    if SessionLocal is None:
+        raise RuntimeError("Database connection is not available: DATABASE_URL is unset or the engine failed to initialize.")
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get a database session.
+    The request is one transaction: CRUD functions flush, and the session is committed once
+    after the endpoint returns (rolled back if it raised). The session is closed after the request.
+    SessionLocal is checked once at startup by ensure_database_configured.
+    """
+    async with SessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
@@ -0,0 +1,28 @@
+# backend/app/db/types.py
+from decimal import Decimal, ROUND_HALF_EVEN
+from typing import Any, Optional
+
+from sqlalchemy import Numeric
+from sqlalchemy.types import TypeDecorator
+
+
+class Money(TypeDecorator):
+    """
+    Exact NUMERIC(precision, scale) storage for money columns.
+    Values are quantized half-even to the column scale once, on the way in, so the database
+    holds exact cents and SUM()s are lossless. Rows still come back as floats (asdecimal=False),
+    which is what the schemas and the invoice math work with.
+    """
+    impl = Numeric
+    cache_ok = True
+
+    def __init__(self, precision: int = 14, scale: int = 2):
+        super().__init__(precision=precision, scale=scale, asdecimal=False)
+        self._quantum = Decimal(1).scaleb(-scale) # Built once per column type, e.g. Decimal("0.01")
+
+    def process_bind_param(self, value: Any, dialect: Any) -> Optional[Decimal]:
+        if value is None:
+            return None
+        if not isinstance(value, Decimal):
+            value = Decimal(repr(float(value))) # Shortest repr, so 0.1 binds as 0.1, not 0.1000000000000000055...
+        return value.quantize(self._quantum, rounding=ROUND_HALF_EVEN)
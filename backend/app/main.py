@@ -1,12 +1,17 @@
 from fastapi import FastAPI
-from app.api import api_router  # We will create this soon
+from app.api import include_api_routers
 from app.core.config import settings # We will create this soon
-from fastapi.middleware.cors import CORSMiddleware
+from app.db.session import dispose_engine, ensure_database_configured, warm_up_pool
+from app.core.cors import FastCORS
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
+import orjson
 import logging
 import sys
-from fastapi import Request
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+from contextlib import asynccontextmanager
+import asyncio
 logger = logging.getLogger(__name__) # Get a logger instance
 
 
@@ -16,10 +21,21 @@ STATIC_DIR = BASE_DIR / "static"
 # UPLOAD_DIR for saving files will be STATIC_DIR / "uploads"
 # (Individual endpoints will handle subdirectories like org_logos, item_images)
 
-# Ensure the base static directory exists (uploads and its subdirs will be created by endpoints)
-STATIC_DIR.mkdir(parents=True, exist_ok=True)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    ensure_database_configured() # Fail at startup rather than on every request
+    # Fill part of the connection pool before serving, while the base static directory is created
+    # off the event loop (uploads and its subdirs will be created by endpoints); close the pool cleanly on shutdown
+    await asyncio.gather(
+        warm_up_pool(),
+        asyncio.to_thread(STATIC_DIR.mkdir, parents=True, exist_ok=True),
+    )
+    yield
+    await dispose_engine()
 
 app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse, # UUIDs/dates/floats encoded in C instead of json.dumps
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     version=settings.PROJECT_VERSION
@@ -27,7 +43,7 @@ app = FastAPI(
 
 
 
-app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+app.mount("/static", StaticFiles(directory=STATIC_DIR, check_dir=False), name="static") # STATIC_DIR is created in lifespan
 
 # --- BEGIN CORS MIDDLEWARE SETUP ---
 # Define a list of origins that are allowed to make cross-origin requests.
@@ -45,30 +61,40 @@ origins = [
 # If you want to allow all origins (USE WITH CAUTION, especially in production):
 # origins = ["*"]
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,  # List of origins that are allowed to make requests
-    allow_credentials=True, # Allow cookies to be included in requests (if you use them)
-    allow_methods=["*"],    # Allow all methods (GET, POST, PUT, DELETE, etc.)
-    allow_headers=["*"],    # Allow all headers
-)
+# Credentialed CORS for these origins, all methods and all headers; header bytes are prebuilt once
+app.add_middleware(FastCORS, origins=origins)
 # --- END CORS MIDDLEWARE SETUP ---
 
 # Ensure settings.API_V1_STR is definitely "/api/v1"
 if settings.API_V1_STR != "/api/v1":
     logger.warning(f"WARNING: settings.API_V1_STR is '{settings.API_V1_STR}', expected '/api/v1'. This might affect routing.")
 
-# Include the main API router
-app.include_router(api_router, prefix=settings.API_V1_STR)
+# Include the API routers
+include_api_routers(app, settings.API_V1_STR)
+
+# Constant bodies for / and /health, encoded once instead of per request
+_ROOT_BODY = orjson.dumps({"message": f"Welcome to {settings.PROJECT_NAME}!"})
+_HEALTH_BODY = orjson.dumps({"status": "ok", "message": f"{settings.PROJECT_NAME} is healthy!"})
 
 @app.get("/")
 async def read_root():
     # If packaged, this route might be overshadowed by the catch-all below, 
     # but good to keep for API-only mode.
-    return {"message": f"Welcome to {settings.PROJECT_NAME}!"}
+    return Response(_ROOT_BODY, media_type="application/json")
+
+@app.get("/health", tags=["Health"])
+async def health_check():
+    """
+    Health check endpoint.
+    """
+    return Response(_HEALTH_BODY, media_type="application/json")
 
 # --- STATIC FILE SERVING FOR PACKAGED APP ---
+import hashlib
+import mimetypes
 import os
+import stat
+from typing import Dict, Optional, Tuple
 from fastapi.responses import FileResponse
 
 # Check if we are running in a packaged environment or if dist folder exists adjacent
@@ -92,9 +118,41 @@ if IS_PACKAGED or (FRONTEND_DIST.exists() and (FRONTEND_DIST / "index.html").exi
     if (FRONTEND_DIST / "assets").exists():
         app.mount("/assets", StaticFiles(directory=FRONTEND_DIST / "assets"), name="assets")
 
+    _FRONTEND_ROOT = FRONTEND_DIST.resolve()
+
+    # The bundle doesn't change while the app runs, so every file in it is listed and stat'ed once.
+    # Lookups are then one dict get; anything not in the map (including "../" paths) is missing.
+    _frontend_files: Dict[str, Tuple[Path, os.stat_result]] = {}
+    for _file in _FRONTEND_ROOT.rglob("*"):
+        _file_stat = _file.stat()
+        if stat.S_ISREG(_file_stat.st_mode):
+            _frontend_files[_file.relative_to(_FRONTEND_ROOT).as_posix()] = (_file, _file_stat)
+
+    # Small bundle files outside /assets (index.html, favicon, manifest, ...) are read once and
+    # served from memory with a precomputed ETag, so revalidations are a single string compare.
+    # They are not content-hashed like /assets, hence no-cache (revalidate) rather than immutable.
+    _IN_MEMORY_MAX_BYTES = 64 * 1024
+    _in_memory_files: Dict[str, Tuple[bytes, str, str]] = {} # relative path -> (body, etag, media type)
+    for _relative, (_file, _file_stat) in _frontend_files.items():
+        if _relative.startswith("assets/") or _file_stat.st_size >= _IN_MEMORY_MAX_BYTES:
+            continue
+        _body = _file.read_bytes()
+        _in_memory_files[_relative] = (
+            _body,
+            f'"{hashlib.blake2b(_body, digest_size=16).hexdigest()}"',
+            mimetypes.guess_type(_file.name)[0] or "application/octet-stream",
+        )
+
+    def _in_memory_response(request: Request, entry: Tuple[bytes, str, str]) -> Response:
+        body, etag, media_type = entry
+        headers = {"etag": etag, "cache-control": "no-cache"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type=media_type, headers=headers)
+
     # Catch-all for React Router
     @app.get("/{full_path:path}")
-    async def serve_react_app(full_path: str):
+    async def serve_react_app(full_path: str, request: Request):
         # Allow API routes to pass through (they are already matched above if defined)
         if full_path.startswith("api") or full_path.startswith("static"):
              # If it fell through to here, it means no specific API route matched.
@@ -103,20 +161,20 @@ if IS_PACKAGED or (FRONTEND_DIST.exists() and (FRONTEND_DIST / "index.html").exi
              pass 
 
         # Check if specific file exists first (e.g. favicon.ico)
-        file_path = FRONTEND_DIST / full_path
-        if file_path.exists() and file_path.is_file():
-            return FileResponse(file_path)
+        entry = _in_memory_files.get(full_path)
+        if entry is not None:
+            return _in_memory_response(request, entry)
+        found = _frontend_files.get(full_path)
+        if found is not None:
+            file_path, file_stat = found
+            return FileResponse(file_path, stat_result=file_stat)
 
         # Otherwise serve index.html
-        return FileResponse(FRONTEND_DIST / "index.html")
+        entry = _in_memory_files.get("index.html")
+        if entry is not None:
+            return _in_memory_response(request, entry)
+        index_path, index_stat = _frontend_files["index.html"]
+        return FileResponse(index_path, stat_result=index_stat)
 # --------------------------------------------
 
-@app.get("/health", tags=["Health"])
-async def health_check():
-    """
-    Health check endpoint.
-    """
-    return {"status": "ok", "message": f"{settings.PROJECT_NAME} is healthy!"}
-
-# You can add more application-wide event handlers here if needed
-# e.g., @app.on_event("startup") / @app.on_event("shutdown")
\ No newline at end of file
+# Application-wide startup/shutdown work belongs in `lifespan` above
\ No newline at end of file
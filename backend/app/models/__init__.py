@@ -6,4 +6,20 @@ from .item import Item
 from .organization import Organization # References User and InvoiceTemplate
 from .customer import Customer
 from .item_image import ItemImage
-from .invoice import Invoice, InvoiceItem
\ No newline at end of file
+from .invoice import Invoice, InvoiceItem
+
+__all__ = [
+    "User",
+    "InvoiceTemplate",
+    "Item",
+    "Organization",
+    "Customer",
+    "ItemImage",
+    "Invoice",
+    "InvoiceItem",
+]
+
+# Every model is imported above, so resolve relationships now (at startup) in one pass
+# instead of on the first query that needs a mapper.
+from sqlalchemy.orm import configure_mappers
+configure_mappers()
@@ -1,14 +1,14 @@
-import uuid
-from sqlalchemy import Column, String, Text, ForeignKey
+from sqlalchemy import Column, String, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
+from app.db.ids import uuid7
 
 class Customer(Base):
     # __tablename__ will be 'customers'
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, index=True)
     company_name = Column(String(255), nullable=False, index=True)
     poc_name = Column(String(255), nullable=True)
 
@@ -25,7 +25,7 @@ class Customer(Base):
     # whatsapp_number = Column(String(50), nullable=True)
 
     # Foreign Key to Organization
-    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False) # Leads ix_customers_org_company_name
     
     # Relationship to Organization: A customer belongs to one organization
     organization = relationship("Organization", back_populates="customers")
@@ -34,8 +34,18 @@ class Customer(Base):
     invoices = relationship(
         "Invoice",
         back_populates="customer",
-        cascade="all, delete-orphan" # If a customer is deleted, their invoices are also deleted
+        cascade="all, delete-orphan", # If a customer is deleted, their invoices are also deleted
+        passive_deletes=True
     )
 
     def __repr__(self):
-        return f"<Customer(id={self.id}, company_name='{self.company_name}')>"
\ No newline at end of file
+        return f"<Customer(id={self.id}, company_name='{self.company_name}')>"
+
+
+# Backs the customer list: WHERE organization_id = ? ORDER BY company_name, read in index order
+Index("ix_customers_org_company_name", Customer.organization_id, Customer.company_name)
+# Trigram index backing the company name search and the case-insensitive name lookup (requires pg_trgm)
+Index(
+    "ix_customers_company_name_trgm", Customer.company_name,
+    postgresql_using="gin", postgresql_ops={"company_name": "gin_trgm_ops"}
+)
\ No newline at end of file
@@ -1,16 +1,24 @@
-import uuid
-from sqlalchemy import Column, String, Text, ForeignKey, Float, Date, DateTime, Enum 
+from sqlalchemy import Column, String, Text, ForeignKey, Float, Date, DateTime, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func # For server-side default timestamps
 
 from app.db.base_class import Base
+from app.db.ids import uuid7
+from app.db.types import Money
 from app.schemas.invoice import InvoiceTypeEnum, InvoiceStatusEnum, PricePerTypeEnum, DiscountTypeEnum # Import enums for DB
 
 class Invoice(Base):
     # __tablename__ will be 'invoices'
+    __table_args__ = (
+        # Trigram index backing the partial-match invoice number search (requires pg_trgm)
+        Index(
+            "ix_invoices_invoice_number_trgm", "invoice_number",
+            postgresql_using="gin", postgresql_ops={"invoice_number": "gin_trgm_ops"}
+        ),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, index=True)
     invoice_number = Column(String(50), nullable=False, index=True) # Should be unique per organization
     invoice_date = Column(Date, nullable=False, default=func.current_date())
     due_date = Column(Date, nullable=True)
@@ -21,17 +29,15 @@ class Invoice(Base):
     
     currency = Column(String(3), nullable=False, default="USD") # Overall invoice currency
 
-    subtotal_amount = Column(Float, nullable=False, default=0.0)
-    tax_percentage = Column(Float, nullable=True) # e.g., 10 for 10%
-    tax_amount = Column(Float, nullable=False, default=0.0)
+    subtotal_amount = Column(Money(14, 2), nullable=False, default=0.0)
     tax_percentage = Column(Float, nullable=True) # e.g., 10 for 10%
-    tax_amount = Column(Float, nullable=False, default=0.0)
+    tax_amount = Column(Money(14, 2), nullable=False, default=0.0)
     
     discount_type = Column(Enum(DiscountTypeEnum, name='discount_type_enum', native_enum=True, create_type=False), default=DiscountTypeEnum.PERCENTAGE, nullable=False)
     discount_percentage = Column(Float, nullable=True) # e.g., 5 for 5%
-    discount_amount = Column(Float, nullable=False, default=0.0)
-    total_amount = Column(Float, nullable=False, default=0.0) # This should be calculated
-    amount_paid = Column(Float, nullable=False, default=0.0)
+    discount_amount = Column(Money(14, 2), nullable=False, default=0.0)
+    total_amount = Column(Money(14, 2), nullable=False, default=0.0) # This should be calculated
+    amount_paid = Column(Money(14, 2), nullable=False, default=0.0)
 
     comments_notes = Column(Text, nullable=True)
     pdf_url = Column(String(1024), nullable=True) # URL to generated PDF
@@ -49,9 +55,11 @@ class Invoice(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Foreign Keys
-    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
-    customer_id = Column(UUID(as_uuid=True), ForeignKey("customers.id"), nullable=False, index=True)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True) # User who created/owns
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False) # Leads the composite indexes below
+    customer_id = Column(UUID(as_uuid=True), ForeignKey("customers.id", ondelete="CASCADE"), nullable=False, index=True)
+    # Copy of customers.company_name so invoice lists don't join customers; kept in sync by crud_invoice's mapper events
+    customer_company_name_snapshot = Column(String(255), nullable=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False) # User who created/owns; leads ix_invoices_user_date_number
 
     # Relationships
     organization = relationship("Organization") # No back_populates needed if Org doesn't list invoices directly
@@ -62,6 +70,7 @@ class Invoice(Base):
         "InvoiceItem",
         back_populates="invoice",
         cascade="all, delete-orphan", # If invoice is deleted, its items are deleted
+        passive_deletes=True,
         lazy="selectin" # Eagerly load line items when an invoice is fetched
     )
 
@@ -69,18 +78,30 @@ class Invoice(Base):
         return f"<Invoice(id={self.id}, invoice_number='{self.invoice_number}')>"
 
 
+# Matches the invoice list's user filter and (invoice_date, invoice_number) DESC ordering, so
+# a page is an index range scan instead of a sort; status/customer_id are carried for filtering.
+Index(
+    "ix_invoices_user_date_number",
+    Invoice.user_id, Invoice.invoice_date.desc(), Invoice.invoice_number.desc(),
+    postgresql_include=["status", "customer_id"]
+)
+# Per-organization views: invoices by status, newest first, and invoices per customer.
+Index("ix_invoices_org_status_date", Invoice.organization_id, Invoice.status, Invoice.invoice_date.desc())
+Index("ix_invoices_org_customer", Invoice.organization_id, Invoice.customer_id)
+
+
 class InvoiceItem(Base):
     # __tablename__ will be 'invoiceitems' (or customize with __tablename__)
     __tablename__ = "invoice_items" # Explicit for clarity
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, index=True)
     item_description = Column(Text, nullable=False) # Can be item name or custom
     
     quantity_cartons = Column(Float, nullable=True)
     quantity_units = Column(Float, nullable=True)
     unit_type = Column(String(50), nullable=True, default="pieces")
     
-    price = Column(Float, nullable=False)
+    price = Column(Money(14, 4), nullable=False) # Unit prices may carry sub-cent precision
     price_per_type = Column(
         Enum(   
             PricePerTypeEnum,
@@ -94,7 +115,7 @@ class InvoiceItem(Base):
     currency = Column(String(3), nullable=False, default="USD")
     
     item_specific_comments = Column(Text, nullable=True)
-    line_total = Column(Float, nullable=False, default=0.0) # Will be calculated
+    line_total = Column(Money(14, 2), nullable=False, default=0.0) # Will be calculated
 
     # --- NEW FIELDS FOR PACKING LIST ---
     net_weight_kgs = Column(Float, nullable=True)
@@ -103,7 +124,7 @@ class InvoiceItem(Base):
     # --- END NEW FIELDS ---
 
     # Foreign Keys
-    invoice_id = Column(UUID(as_uuid=True), ForeignKey("invoices.id"), nullable=False, index=True)
+    invoice_id = Column(UUID(as_uuid=True), ForeignKey("invoices.id", ondelete="CASCADE"), nullable=False, index=True)
     item_id = Column(UUID(as_uuid=True), ForeignKey("items.id"), nullable=True, index=True) # Optional link to a predefined item
 
     # Relationships
@@ -1,15 +1,15 @@
 # backend/app/models/invoice_template.py
-import uuid
 from sqlalchemy import Column, String, Text, Boolean, Integer # Removed ForeignKey as it's not used here
 from sqlalchemy.dialects.postgresql import UUID
-# from sqlalchemy.orm import relationship # Not used here
+from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base # <<< CRITICAL: Ensure this is the correct import
+from app.db.ids import uuid7
 
 class InvoiceTemplate(Base): # <<< CRITICAL: Ensure it inherits from Base
     # __tablename__ will be 'invoice_templates'
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, index=True)
     name = Column(String(255), nullable=False, unique=True, index=True)
     description = Column(Text, nullable=True)
     template_file_path = Column(String(255), nullable=False, unique=True)
@@ -17,5 +17,13 @@ class InvoiceTemplate(Base): # <<< CRITICAL: Ensure it inherits from Base
     is_system_default = Column(Boolean, default=False, nullable=False)
     order_index = Column(Integer, default=0, nullable=False)
 
+    # Reverse side of Organization.selected_invoice_template. Nothing reads it, so attribute access raises
+    # instead of lazy-loading; deleting a template still nulls out the organizations pointing at it.
+    organizations_using_this_template = relationship(
+        "Organization",
+        back_populates="selected_invoice_template",
+        lazy="raise"
+    )
+
     def __repr__(self):
         return f"<InvoiceTemplate(id={self.id}, name='{self.name}', path='{self.template_file_path}')>"
\ No newline at end of file
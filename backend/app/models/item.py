@@ -1,17 +1,18 @@
-import uuid
-from sqlalchemy import Column, String, Text, ForeignKey, Float, JSON
+from sqlalchemy import Column, String, Text, ForeignKey, JSON, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
+from app.db.ids import uuid7
+from app.db.types import Money
 
 class Item(Base):
     # __tablename__ will be 'items'
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, index=True)
     name = Column(String(255), nullable=False, index=True)
     description = Column(Text, nullable=True)
-    default_price = Column(Float, nullable=True) # Check constraint for > 0 can be added at DB level if needed
+    default_price = Column(Money(14, 4), nullable=True) # Same scale as InvoiceItem.price, which it pre-fills
     default_unit = Column(String(50), nullable=True) # e.g., "piece", "carton", "kg"
     
     # For handling multiple images, a JSONB column is flexible.
@@ -20,7 +21,7 @@ class Item(Base):
     
 
     # Foreign Key to Organization
-    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False) # Leads the indexes below
     
     # Relationship to Organization: An item belongs to one organization
     organization = relationship("Organization", back_populates="items")
@@ -29,6 +30,7 @@ class Item(Base):
               "ItemImage", # String reference to avoid circular import issues at module load time
               back_populates="item",
               cascade="all, delete-orphan", # If item is deleted, its images are deleted
+              passive_deletes=True,
               lazy="selectin",
               order_by="ItemImage.order_index"  # Eagerly load images when an item is fetched
     )
@@ -39,4 +41,15 @@ class Item(Base):
     # invoice_line_items = relationship("InvoiceItem", back_populates="item")
 
     def __repr__(self):
-        return f"<Item(id={self.id}, name='{self.name}')>"
\ No newline at end of file
+        return f"<Item(id={self.id}, name='{self.name}')>"
+
+
+# Backs the case-insensitive name lookup: WHERE organization_id = ? AND lower(name) = ?
+Index("ix_items_org_lower_name", Item.organization_id, func.lower(Item.name))
+# Backs the item list: WHERE organization_id = ? ORDER BY name, read in index order
+Index("ix_items_org_name", Item.organization_id, Item.name)
+# Trigram index backing the partial-match item name search (requires pg_trgm)
+Index(
+    "ix_items_name_trgm", Item.name,
+    postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}
+)
@@ -1,21 +1,28 @@
 # backend/app/models/item_image.py
-import uuid
-from typing import Optional
-from sqlalchemy import Column, String, ForeignKey, Integer
+from sqlalchemy import Column, String, ForeignKey, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
+from app.db.ids import uuid7
 
 class ItemImage(Base):
     __tablename__ = "item_images"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    item_id = Column(UUID(as_uuid=True), ForeignKey("items.id"), nullable=False, index=True)
-    image_url = Column(String(1024), nullable=False) # Relative path to the image file
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, index=True)
+    item_id = Column(UUID(as_uuid=True), ForeignKey("items.id", ondelete="CASCADE"), nullable=False) # Leads ix_item_images_item_order
+    image_url = Column(String(512), nullable=False) # Relative path to the image file
     order_index = Column(Integer, default=0) # For ordering images if needed
-    alt_text: Optional[str] = Column(String(255), nullable=True) # Optional
+    alt_text = Column(String(255), nullable=True) # Optional
 
     item = relationship("Item", back_populates="images")
 
     def __repr__(self):
-        return f"<ItemImage(id={self.id}, item_id={self.item_id}, url='{self.image_url}')>"
\ No newline at end of file
+        return f"<ItemImage(id={self.id}, item_id={self.item_id}, url='{self.image_url}')>"
+
+
+# Images of an item in display order; image_url is included so the item list's
+# first-image lookup is answered from the index alone
+Index(
+    "ix_item_images_item_order", ItemImage.item_id, ItemImage.order_index,
+    postgresql_include=["image_url"]
+)
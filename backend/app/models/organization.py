@@ -1,17 +1,17 @@
-import uuid
 from sqlalchemy import Column, String, Text, ForeignKey # ForeignKey is used
 from sqlalchemy.dialects.postgresql import UUID # UUID is used
 from sqlalchemy.orm import relationship # relationship is used
 
 from app.db.base_class import Base # Our custom declarative base
+from app.db.ids import uuid7
 
 class Organization(Base):
     # __tablename__ will be 'organizations' due to our CustomBase
     # (Assuming your Base class handles table name generation, e.g., pluralizing the class name)
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, index=True)
     name = Column(String(255), nullable=False, index=True)
-    logo_url = Column(String(1024), nullable=True) # Store URL to logo
+    logo_url = Column(String(512), nullable=True) # Store URL to logo
 
     # Address fields
     address_line1 = Column(String(255), nullable=True)
@@ -27,20 +27,22 @@ class Organization(Base):
     # --- USER RELATIONSHIP ---
     # This links an organization to its owning user.
     # Every organization must have an owner.
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     owner = relationship("User", back_populates="organizations") # Must match 'organizations' in User model
     # --- END USER RELATIONSHIP ---
     # --- ADD CUSTOMERS RELATIONSHIP ---
     customers = relationship(
         "Customer",
         back_populates="organization", # Must match 'organization' in Customer model
-        cascade="all, delete-orphan" # If an org is deleted, its customers are also deleted
+        cascade="all, delete-orphan", # If an org is deleted, its customers are also deleted
+        passive_deletes=True # ...by the FK's ON DELETE CASCADE, without loading them first
     )
     # --- END CUSTOMERS RELATIONSHIP ---
     items = relationship(
         "Item",
         back_populates="organization", # Must match 'organization' in Item model
-        cascade="all, delete-orphan" # If an org is deleted, its items are also deleted
+        cascade="all, delete-orphan", # If an org is deleted, its items are also deleted
+        passive_deletes=True
     )
 
     # --- NEW: Link to InvoiceTemplate ---
@@ -52,8 +54,8 @@ class Organization(Base):
 
     selected_invoice_template = relationship(
         "InvoiceTemplate", # String reference to avoid circular import if InvoiceTemplate model also refers to Organization
-        backref="organizations_using_this_template", # Optional: allows InvoiceTemplate to see which orgs use it
-        lazy="selectin" # Eagerly load the selected template details when an org is fetched
+        back_populates="organizations_using_this_template", # Must match 'organizations_using_this_template' in InvoiceTemplate model
+        lazy="raise_on_sql" # Loaded only where it is read (org responses, PDF rendering); elsewhere it must not cost a query
     )
     # --- END NEW ---
 
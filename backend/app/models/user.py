@@ -1,13 +1,13 @@
-import uuid
 from sqlalchemy import Column, String, Boolean, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
+from app.db.ids import uuid7
 
 class User(Base):
       # __tablename__ will be 'users'
 
-      id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+      id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, index=True)
       full_name = Column(String(255), index=True, nullable=True)
       email = Column(String(255), unique=True, index=True, nullable=False)
       hashed_password = Column(String(255), nullable=False)
@@ -18,7 +18,8 @@ class User(Base):
       organizations = relationship(
           "Organization",
           back_populates="owner", # Must match 'owner' in Organization model
-          cascade="all, delete-orphan"
+          cascade="all, delete-orphan",
+          passive_deletes=True # organizations.user_id is ON DELETE CASCADE; unloaded orgs are left to the database
       )
 
       def __repr__(self):
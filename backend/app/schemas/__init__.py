@@ -1,12 +1,13 @@
 from .organization import Organization, OrganizationCreate, OrganizationUpdate, OrganizationSummary
 from .user import User, UserCreate, UserUpdate, UserOut, Token, TokenPayload
-from .customer import Customer, CustomerCreate, CustomerUpdate, CustomerSummary
-from .item import Item, ItemCreate, ItemUpdate, ItemSummary, ItemImage
-from .invoice import Invoice, InvoiceCreate, InvoiceUpdate, InvoiceSummary, InvoiceItem, InvoiceItemCreate, InvoiceItemUpdate, InvoiceTypeEnum, InvoiceStatusEnum, PricePerTypeEnum, PaymentRecordIn
+from .customer import Customer, CustomerCreate, CustomerUpdate, CustomerSummary, CustomerSummaryListAdapter
+from .item import Item, ItemDetail, ItemCreate, ItemUpdate, ItemSummary, ItemImage, ItemSummaryListAdapter
+from .invoice import Invoice, InvoiceCreate, InvoiceUpdate, InvoiceSummary, InvoiceSummaryListAdapter, InvoiceItem, InvoiceItemCreate, InvoiceItemUpdate, InvoiceTypeEnum, InvoiceStatusEnum, PricePerTypeEnum, PaymentRecordIn
 from .dashboard import DashboardStats, DashboardFilters
 from .invoice_template import (
     InvoiceTemplate, 
     InvoiceTemplateCreate, 
     InvoiceTemplateUpdate, 
-    InvoiceTemplateSummary
+    InvoiceTemplateSummary,
+    InvoiceTemplateSummaryListAdapter
 )
@@ -0,0 +1,18 @@
+# backend/app/schemas/base.py
+from typing import Any, Type, TypeVar
+
+from pydantic import BaseModel
+
+_SchemaT = TypeVar("_SchemaT", bound=BaseModel)
+
+
+class FromRowMixin:
+    """
+    Adds from_row(), which builds a response schema from a trusted ORM instance or row via
+    model_construct, skipping validation. Only for schemas without validators, fed values that
+    came straight from the database. Schemas with nested models override it to build those too.
+    """
+
+    @classmethod
+    def from_row(cls: Type[_SchemaT], row: Any) -> _SchemaT:
+        return cls.model_construct(**{field: getattr(row, field) for field in cls.model_fields})
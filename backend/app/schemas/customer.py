@@ -1,10 +1,13 @@
-from pydantic import BaseModel, EmailStr, constr
-from typing import Optional
+from pydantic import BaseModel, EmailStr, StringConstraints, ConfigDict, TypeAdapter
+from typing import Annotated, List, Optional
 import uuid
 
+# Constrained string types, built once and shared by the create/update schemas
+CompanyNameStr = Annotated[str, StringConstraints(min_length=1, max_length=255)]
+
 # Shared properties for a customer
 class CustomerBase(BaseModel):
-    company_name: constr(min_length=1, max_length=255)
+    company_name: CompanyNameStr
     poc_name: Optional[str] = None
     billing_address_line1: Optional[str] = None
     billing_address_line2: Optional[str] = None
@@ -23,7 +26,7 @@ class CustomerCreate(CustomerBase):
 
 # Properties to receive on customer update (all fields optional)
 class CustomerUpdate(BaseModel): # Explicitly make all fields optional for update
-    company_name: Optional[constr(min_length=1, max_length=255)] = None
+    company_name: Optional[CompanyNameStr] = None
     poc_name: Optional[str] = None
     billing_address_line1: Optional[str] = None
     billing_address_line2: Optional[str] = None
@@ -40,8 +43,7 @@ class CustomerInDBBase(CustomerBase):
     id: uuid.UUID
     organization_id: uuid.UUID # Foreign Key to Organization
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Properties to return to client
 class Customer(CustomerInDBBase):
@@ -54,5 +56,7 @@ class CustomerSummary(BaseModel):
     poc_name: Optional[str] = None
     email: Optional[EmailStr] = None
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+# List validator for pages of customer rows (used by the assistant's customer lookup)
+CustomerSummaryListAdapter = TypeAdapter(List[CustomerSummary])
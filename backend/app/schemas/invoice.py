@@ -1,9 +1,12 @@
-from pydantic import BaseModel, Field, constr, validator, HttpUrl
-from typing import Optional, List
+from pydantic import AliasChoices, BaseModel, Field, StringConstraints, ConfigDict, TypeAdapter
+from typing import Annotated, Optional, List
 import uuid
 from datetime import date, datetime # For dates and timestamps
 from enum import Enum
 
+# Constrained string types, built once and shared by the create/update schemas
+InvoiceNumberStr = Annotated[str, StringConstraints(min_length=1, max_length=50)]
+
 # --- Enums for Invoice ---
 class InvoiceTypeEnum(str, Enum):
     PRO_FORMA = "PRO_FORMA"
@@ -49,19 +52,19 @@ class InvoiceItemCreate(InvoiceItemBase):
 
 class InvoiceItemUpdate(BaseModel): # All fields optional for update
     item_description: Optional[str] = None
-    quantity_cartons: Optional[float] = Field(default=None, ge=0, allow_none=True) # allow_none for explicit null
-    quantity_units: Optional[float] = Field(default=None, ge=0, allow_none=True)
+    quantity_cartons: Optional[float] = Field(default=None, ge=0)
+    quantity_units: Optional[float] = Field(default=None, ge=0)
     unit_type: Optional[str] = None
-    price: Optional[float] = Field(default=None, gt=0, allow_none=True)
+    price: Optional[float] = Field(default=None, gt=0)
     price_per_type: Optional[PricePerTypeEnum] = None
-    currency: Optional[str] = Field(default=None, max_length=3, min_length=3, allow_none=True)
+    currency: Optional[str] = Field(default=None, max_length=3, min_length=3)
     item_specific_comments: Optional[str] = None
     item_id: Optional[uuid.UUID] = None # Allow changing/setting linked item
 
     # --- NEW OPTIONAL FIELDS for update ---
-    net_weight_kgs: Optional[float] = Field(default=None, ge=0, allow_none=True)
-    gross_weight_kgs: Optional[float] = Field(default=None, ge=0, allow_none=True)
-    measurement_cbm: Optional[float] = Field(default=None, ge=0, allow_none=True)
+    net_weight_kgs: Optional[float] = Field(default=None, ge=0)
+    gross_weight_kgs: Optional[float] = Field(default=None, ge=0)
+    measurement_cbm: Optional[float] = Field(default=None, ge=0)
     # --- END NEW FIELDS ---
 
 class InvoiceItem(InvoiceItemBase): # Response model for InvoiceItem
@@ -70,13 +73,12 @@ class InvoiceItem(InvoiceItemBase): # Response model for InvoiceItem
     item_id: Optional[uuid.UUID] = None 
     line_total: float 
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # --- Invoice Schemas ---
 class InvoiceBase(BaseModel):
-    invoice_number: constr(min_length=1, max_length=50)
+    invoice_number: InvoiceNumberStr
     invoice_date: date = Field(default_factory=date.today)
     due_date: Optional[date] = None
     invoice_type: InvoiceTypeEnum = InvoiceTypeEnum.COMMERCIAL
@@ -87,7 +89,7 @@ class InvoiceBase(BaseModel):
     
     discount_type: DiscountTypeEnum = DiscountTypeEnum.PERCENTAGE
 
-    tax_percentage: Optional[float] = Field(default=None, ge=0, allow_none=True)
+    tax_percentage: Optional[float] = Field(default=None, ge=0)
     tax_amount: Optional[float] = Field(default=0.0, ge=0)
     discount_percentage: Optional[float] = Field(default=None, ge=0, le=100)
     discount_amount: Optional[float] = Field(default=0.0, ge=0)
@@ -95,7 +97,7 @@ class InvoiceBase(BaseModel):
     amount_paid: Optional[float] = Field(default=0.0, ge=0)
     
     comments_notes: Optional[str] = None
-    pdf_url: Optional[HttpUrl] = None # Kept as HttpUrl here
+    pdf_url: Optional[str] = None # Server-generated path, so no HttpUrl parsing
 
     # --- NEW OPTIONAL FIELDS as per feedback ---
     container_number: Optional[str] = Field(default=None, max_length=100)
@@ -121,53 +123,44 @@ class InvoiceCreate(InvoiceBase):
     tax_amount: Optional[float] = Field(None, exclude=True)
     total_amount: Optional[float] = Field(None, exclude=True)
     amount_paid: float = Field(0.0, exclude=True) # Default to 0, exclude from client input
-    pdf_url: Optional[HttpUrl] = Field(None, exclude=True)
+    pdf_url: Optional[str] = Field(None, exclude=True)
     invoice_type: InvoiceTypeEnum = InvoiceTypeEnum.COMMERCIAL
     
     # New fields (container_number, seal_number, hs_code) are inherited as optional from InvoiceBase.
 
-    @validator('line_items', pre=True, always=True)
-    def check_line_items_not_empty_if_not_draft(cls, v, values):
-        # Allow draft invoices to be created without line items.
-        # For other statuses, line items might be required depending on business logic.
-        # This example keeps it flexible; for production, you might enforce for non-draft.
-        # if values.get('status') != InvoiceStatusEnum.DRAFT and not v:
-        #     raise ValueError('Invoice must have at least one line item if not a DRAFT.')
-        return v
-
 
 class InvoiceUpdate(BaseModel): 
-    invoice_number: Optional[constr(min_length=1, max_length=50)] = None
+    invoice_number: Optional[InvoiceNumberStr] = None
     invoice_date: Optional[date] = None
     due_date: Optional[date] = None
     invoice_type: Optional[InvoiceTypeEnum] = None
     status: Optional[InvoiceStatusEnum] = None
     status: Optional[InvoiceStatusEnum] = None
-    currency: Optional[str] = Field(default=None, max_length=3, min_length=3, allow_none=True)
+    currency: Optional[str] = Field(default=None, max_length=3, min_length=3)
     
     discount_type: Optional[DiscountTypeEnum] = None
 
     customer_id: Optional[uuid.UUID] = None 
     
-    subtotal_amount: Optional[float] = Field(default=None, ge=0, allow_none=True)
-    tax_percentage: Optional[float] = Field(default=None, ge=0, le=100, allow_none=True)
-    tax_amount: Optional[float] = Field(default=None, ge=0, allow_none=True)
-    discount_percentage: Optional[float] = Field(default=None, ge=0, le=100, allow_none=True)
-    discount_amount: Optional[float] = Field(default=None, ge=0, allow_none=True)
-    total_amount: Optional[float] = Field(default=None, ge=0, allow_none=True)
-    amount_paid: Optional[float] = Field(default=None, ge=0, allow_none=True)
+    subtotal_amount: Optional[float] = Field(default=None, ge=0)
+    tax_percentage: Optional[float] = Field(default=None, ge=0, le=100)
+    tax_amount: Optional[float] = Field(default=None, ge=0)
+    discount_percentage: Optional[float] = Field(default=None, ge=0, le=100)
+    discount_amount: Optional[float] = Field(default=None, ge=0)
+    total_amount: Optional[float] = Field(default=None, ge=0)
+    amount_paid: Optional[float] = Field(default=None, ge=0)
     
     comments_notes: Optional[str] = None
     line_items: Optional[List[InvoiceItemCreate]] = None 
     # pdf_url is not updatable by client
 
     # --- NEW OPTIONAL FIELDS for update as per feedback ---
-    container_number: Optional[str] = Field(default=None, max_length=100, validate_default=False)
-    seal_number: Optional[str] = Field(default=None, max_length=100, validate_default=False)
-    hs_code: Optional[str] = Field(default=None, max_length=100, validate_default=False)
+    container_number: Optional[str] = Field(default=None, max_length=100)
+    seal_number: Optional[str] = Field(default=None, max_length=100)
+    hs_code: Optional[str] = Field(default=None, max_length=100)
     # --- END NEW FIELDS ---
 
-    bl_number: Optional[str] = Field(default=None, max_length=100, validate_default=False)
+    bl_number: Optional[str] = Field(default=None, max_length=100)
 
 
 class Invoice(InvoiceBase): # Full invoice response model
@@ -177,23 +170,28 @@ class Invoice(InvoiceBase): # Full invoice response model
     line_items: List[InvoiceItem] = [] 
     created_at: datetime
     updated_at: datetime
-    # container_number, seal_number, hs_code, pdf_url are inherited from InvoiceBase
+    pdf_url: Optional[str] = None # Read back from the DB
+    # container_number, seal_number, hs_code are inherited from InvoiceBase
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class InvoiceSummary(BaseModel): # For lists
     id: uuid.UUID
     invoice_number: str
     invoice_date: date
-    customer_company_name: Optional[str] = None 
+    # Read from Invoice.customer_company_name_snapshot when validating an ORM row
+    customer_company_name: Optional[str] = Field(
+        default=None, validation_alias=AliasChoices("customer_company_name", "customer_company_name_snapshot")
+    )
     total_amount: float
     currency: str
     status: InvoiceStatusEnum
     invoice_type: InvoiceTypeEnum
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+# Built once; validates and dumps invoice list pages in a single call
+InvoiceSummaryListAdapter = TypeAdapter(List[InvoiceSummary])
 
 class PaymentRecordIn(BaseModel):
     amount_paid_now: float = Field(..., gt=0, description="The amount being paid in this transaction.")
@@ -1,13 +1,19 @@
 # backend/app/schemas/invoice_template.py
-from pydantic import BaseModel, constr
-from typing import Optional
+from pydantic import BaseModel, StringConstraints, ConfigDict, TypeAdapter
+from typing import Annotated, List, Optional
 import uuid
 
+from app.schemas.base import FromRowMixin
+
+# Constrained string types, built once and shared by the create/update schemas
+TemplateNameStr = Annotated[str, StringConstraints(min_length=1, max_length=255)]
+TemplateFilePathStr = Annotated[str, StringConstraints(min_length=1, max_length=255)]
+
 # Shared base properties
 class InvoiceTemplateBase(BaseModel):
-    name: constr(min_length=1, max_length=255)
+    name: TemplateNameStr
     description: Optional[str] = None
-    template_file_path: constr(min_length=1, max_length=255) # e.g., "modern_template.html"
+    template_file_path: TemplateFilePathStr # e.g., "modern_template.html"
     thumbnail_url: Optional[str] = None # Optional URL for a preview image
     is_system_default: Optional[bool] = False
     order_index: Optional[int] = 0
@@ -18,9 +24,9 @@ class InvoiceTemplateCreate(InvoiceTemplateBase):
 
 # Properties to receive on template update (all fields optional)
 class InvoiceTemplateUpdate(BaseModel):
-    name: Optional[constr(min_length=1, max_length=255)] = None
+    name: Optional[TemplateNameStr] = None
     description: Optional[str] = None
-    template_file_path: Optional[constr(min_length=1, max_length=255)] = None
+    template_file_path: Optional[TemplateFilePathStr] = None
     thumbnail_url: Optional[str] = None
     is_system_default: Optional[bool] = None
     order_index: Optional[int] = None
@@ -29,15 +35,14 @@ class InvoiceTemplateUpdate(BaseModel):
 class InvoiceTemplateInDBBase(InvoiceTemplateBase):
     id: uuid.UUID
 
-    class Config:
-        from_attributes = True # Pydantic v2 replaces orm_mode
+    model_config = ConfigDict(from_attributes=True) # Pydantic v2 replaces orm_mode
 
 # Properties to return to client (the main schema for responses)
 class InvoiceTemplate(InvoiceTemplateInDBBase):
     pass # Inherits all fields from InvoiceTemplateInDBBase
 
 # Properties for a summary list of templates
-class InvoiceTemplateSummary(BaseModel):
+class InvoiceTemplateSummary(FromRowMixin, BaseModel):
     id: uuid.UUID
     name: str
     description: Optional[str] = None
@@ -45,5 +50,7 @@ class InvoiceTemplateSummary(BaseModel):
     is_system_default: bool
     order_index: int
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+# Used by the template list endpoint to validate and encode the page in one call
+InvoiceTemplateSummaryListAdapter = TypeAdapter(List[InvoiceTemplateSummary])
@@ -1,26 +1,32 @@
 # backend/app/schemas/item.py
-from pydantic import BaseModel, HttpUrl, constr, Field # HttpUrl might not be needed if storing relative paths
-from typing import Optional, List
+from pydantic import BaseModel, StringConstraints, Field, ConfigDict, TypeAdapter
+from typing import Annotated, Any, Optional, List
 import uuid
 
+from app.schemas.base import FromRowMixin
+
+# Constrained field types, built once and shared by the create/update schemas
+ItemNameStr = Annotated[str, StringConstraints(min_length=1, max_length=255)]
+ImageUrlStr = Annotated[str, StringConstraints(max_length=512)] # Matches item_images.image_url
+PriceFloat = Annotated[float, Field(ge=0)] # Allow 0 for items like packing materials
+
 class ItemImageBase(BaseModel):
-    image_url: str # Relative path like /static/uploads/item_images/item_id/filename.jpg
+    image_url: ImageUrlStr # Relative path like /static/uploads/item_images/item_id/filename.jpg
     order_index: Optional[int] = 0
     alt_text: Optional[str] = None
 
 class ItemImageCreate(ItemImageBase): # For internal use or specific endpoint
     item_id: uuid.UUID
 
-class ItemImage(ItemImageBase): # Response schema for an image
+class ItemImage(FromRowMixin, ItemImageBase): # Response schema for an image
     id: uuid.UUID
     alt_text: Optional[str] = None
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class ItemBase(BaseModel):
-    name: constr(min_length=1, max_length=255)
+    name: ItemNameStr
     description: Optional[str] = None
-    default_price: Optional[float] = Field(default=None, ge=0) # Allow 0 for items like packing materials
+    default_price: Optional[PriceFloat] = None
     default_unit: Optional[str] = None
     # image_url was removed from here
 
@@ -29,19 +35,27 @@ class ItemCreate(ItemBase):
     # Images are uploaded via a separate endpoint after item creation or during item update
 
 class ItemUpdate(BaseModel):
-    name: Optional[constr(min_length=1, max_length=255)] = None
+    name: Optional[ItemNameStr] = None
     description: Optional[str] = None
-    default_price: Optional[float] = Field(default=None, ge=0, allow_none=True)
+    default_price: Optional[PriceFloat] = None
     default_unit: Optional[str] = None
     # Images are managed via separate endpoints
 
-class Item(ItemBase): # Full Item response schema
+class Item(FromRowMixin, ItemBase): # Item response schema (create/update/delete); images are not included
     id: uuid.UUID
     organization_id: uuid.UUID
-    images: List[ItemImage] = [] # List of associated images
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+class ItemDetail(Item): # Single-item view: the item plus its images, in display order
+    images: List[ItemImage] = []
+
+    @classmethod
+    def from_row(cls, row: Any) -> "ItemDetail":
+        return cls.model_construct(
+            **{field: getattr(row, field) for field in Item.model_fields},
+            images=[ItemImage.from_row(image) for image in row.images],
+        )
 
 class ItemSummary(BaseModel): # For lists
     id: uuid.UUID
@@ -51,5 +65,8 @@ class ItemSummary(BaseModel): # For lists
     default_unit: Optional[str] = None
     primary_image_url: Optional[str] = None # Will be the URL of the first image (e.g., lowest order_index)
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+# Validates (from_attributes) and dumps a whole page of rows in one pydantic-core call, instead of
+# a model_validate/model_dump round trip per row
+ItemSummaryListAdapter = TypeAdapter(List[ItemSummary])
@@ -1,11 +1,16 @@
-from pydantic import BaseModel, HttpUrl, EmailStr, constr
-from typing import Optional
+from pydantic import BaseModel, EmailStr, StringConstraints, ConfigDict
+from typing import Annotated, Any, Optional
 import uuid # For UUIDs as primary keys
+from app.schemas.base import FromRowMixin
 from app.schemas.invoice_template import InvoiceTemplateSummary
 
+# Constrained string types, built once and shared by the create/update schemas
+OrganizationNameStr = Annotated[str, StringConstraints(min_length=1, max_length=255)]
+LogoUrlStr = Annotated[str, StringConstraints(max_length=512)] # Matches organizations.logo_url
+
 # Shared properties
 class OrganizationBase(BaseModel):
-    name: constr(min_length=1, max_length=255)
+    name: OrganizationNameStr
     address_line1: Optional[str] = None
     address_line2: Optional[str] = None
     city: Optional[str] = None
@@ -14,7 +19,7 @@ class OrganizationBase(BaseModel):
     country: Optional[str] = None
     contact_email: Optional[EmailStr] = None
     contact_phone: Optional[str] = None
-    logo_url: Optional[str] = None
+    logo_url: Optional[LogoUrlStr] = None
     selected_invoice_template_id: Optional[uuid.UUID] = None
 
 # Properties to receive on organization creation
@@ -24,7 +29,7 @@ class OrganizationCreate(OrganizationBase):
 # Properties to receive on organization update
 class OrganizationUpdate(OrganizationBase):
     # All fields are optional for update
-    name: Optional[constr(min_length=1, max_length=255)] = None
+    name: Optional[OrganizationNameStr] = None
     # No need to redefine all, Pydantic handles optionality of inherited fields correctly
     # if they are not explicitly re-declared as non-optional.
     # However, to make it explicit that all fields are optional during update:
@@ -36,7 +41,7 @@ class OrganizationUpdate(OrganizationBase):
     country: Optional[str] = None
     contact_email: Optional[EmailStr] = None
     contact_phone: Optional[str] = None
-    logo_url: Optional[str] = None
+    logo_url: Optional[LogoUrlStr] = None
     selected_invoice_template_id: Optional[uuid.UUID] = None
 
 
@@ -48,18 +53,24 @@ class OrganizationInDBBase(OrganizationBase):
     # created_at: datetime # Will add later with a base model
     # updated_at: datetime # Will add later with a base model
 
-    class Config:
-        from_attributes = True # Replaces orm_mode = True in Pydantic v2
+    model_config = ConfigDict(from_attributes=True) # Replaces orm_mode = True in Pydantic v2
 
 # Properties to return to client
-class Organization(OrganizationInDBBase):
+class Organization(FromRowMixin, OrganizationInDBBase):
     selected_invoice_template: Optional[InvoiceTemplateSummary] = None # Inherits all fields from OrganizationInDBBase
 
+    @classmethod
+    def from_row(cls, row: Any) -> "Organization":
+        template = row.selected_invoice_template
+        return cls.model_construct(
+            **{field: getattr(row, field) for field in OrganizationInDBBase.model_fields},
+            selected_invoice_template=InvoiceTemplateSummary.from_row(template) if template is not None else None,
+        )
+
 # Properties to return in a list
 class OrganizationSummary(BaseModel):
     id: uuid.UUID
     name: str
     logo_url: Optional[str] = None
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -1,6 +1,11 @@
-from pydantic import BaseModel, EmailStr, constr
-from typing import Optional
+from pydantic import BaseModel, EmailStr, StringConstraints, ConfigDict
+from typing import Annotated, Optional
 import uuid
+
+from app.schemas.base import FromRowMixin
+
+# Constrained string types, built once and shared by the create/update schemas
+PasswordStr = Annotated[str, StringConstraints(min_length=8)]
 # Shared properties
 
 class UserBase(BaseModel):
@@ -11,13 +16,13 @@ class UserBase(BaseModel):
 
 # Properties to receive via API on creation
 class UserCreate(UserBase):
-    password: constr(min_length=8) # Enforce minimum password length
+    password: PasswordStr # Enforce minimum password length
 
 # Properties to receive via API on update
 class UserUpdate(BaseModel): # Allow partial updates
     email: Optional[EmailStr] = None
     full_name: Optional[str] = None
-    password: Optional[constr(min_length=8)] = None
+    password: Optional[PasswordStr] = None
     is_active: Optional[bool] = None
 
 # Properties stored in DB
@@ -25,8 +30,7 @@ class UserInDBBase(UserBase):
     id: uuid.UUID
     hashed_password: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Additional properties to return to client (never include password)
 class User(UserInDBBase):
@@ -50,10 +54,9 @@ class User(UserInDBBase):
     pass
 
 # Schema for user response (without hashed_password)
-class UserOut(UserBase):
+class UserOut(FromRowMixin, UserBase):
     id: uuid.UUID
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Schema for token data
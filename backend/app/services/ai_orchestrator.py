@@ -87,10 +87,8 @@ async def execute_get_customers_for_organization(db: AsyncSession, org_id: uuid.
     customers = await crud.customer.get_customers_by_organization(db, organization_id=org_id, limit=50) # Limit for AI context
     if customers:
         # Using CustomerSummary schema for the list view
-        customer_summaries = [
-            make_model_dump_json_serializable(schemas.CustomerSummary.model_validate(cust).model_dump()) 
-            for cust in customers
-        ]
+        adapter = schemas.CustomerSummaryListAdapter
+        customer_summaries = adapter.dump_python(adapter.validate_python(customers, from_attributes=True), mode="json")
         return {"status": "success", "count": len(customer_summaries), "customers": customer_summaries}
     return {"status": "not_found", "message": "No customers found for this organization."}
 
@@ -144,7 +142,7 @@ async def execute_update_customer_func(db: AsyncSession, org_id: uuid.UUID, user
 async def execute_get_item_by_name(db: AsyncSession, org_id: uuid.UUID, user_id: uuid.UUID, item_name: str) -> Dict[str, Any]:
     item = await crud.item.get_item_by_name_for_org(db, name=item_name, organization_id=org_id)
     if item:
-        item_dict = schemas.Item.model_validate(item).model_dump()
+        item_dict = schemas.Item.from_row(item).model_dump()
         return {"status": "success", "item_id": str(item.id), "data": make_model_dump_json_serializable(item_dict)}
     return {"status": "not_found", "message": f"Item '{item_name}' not found."}
 
@@ -155,20 +153,21 @@ async def execute_create_item_func(db: AsyncSession, org_id: uuid.UUID, user_id:
     item_schema = schemas.ItemCreate(organization_id=org_id, **item_data_in)
     existing_item = await crud.item.get_item_by_name_for_org(db, name=item_schema.name, organization_id=org_id)
     if existing_item:
-        existing_item_dict = schemas.Item.model_validate(existing_item).model_dump()
+        existing_item_dict = schemas.Item.from_row(existing_item).model_dump()
         return {"status": "already_exists", "item_id": str(existing_item.id), "data": make_model_dump_json_serializable(existing_item_dict)}
     try:
         new_item = await crud.item.create_item(db, item_in=item_schema)
-        new_item_dict = schemas.Item.model_validate(new_item).model_dump()
+        new_item_dict = schemas.Item.from_row(new_item).model_dump()
         return {"status": "success", "item_id": str(new_item.id), "data": make_model_dump_json_serializable(new_item_dict)}
     except Exception as e:
         traceback.print_exc()
         return {"status": "error", "message": f"Failed to create item: {str(e)}"}
 
 async def execute_get_items_for_organization(db: AsyncSession, org_id: uuid.UUID, user_id: uuid.UUID, search_term: Optional[str] = None) -> Dict[str, Any]:
-    items = await crud.item.get_items_by_organization(db, organization_id=org_id, search=search_term, limit=20) # Limit for AI context
+    items = await crud.item.get_item_summaries_by_organization(db, organization_id=org_id, search=search_term, limit=20) # Limit for AI context
     if items:
-        return {"status": "success", "count": len(items), "items": [make_model_dump_json_serializable(schemas.ItemSummary.model_validate(item).model_dump()) for item in items]}
+        adapter = schemas.ItemSummaryListAdapter
+        return {"status": "success", "count": len(items), "items": adapter.dump_python(adapter.validate_python(items, from_attributes=True), mode="json")}
     return {"status": "not_found", "message": "No items found" + (f" matching '{search_term}'." if search_term else " for this organization.")}
 
 async def execute_get_item_details_by_id(db: AsyncSession, org_id: uuid.UUID, user_id: uuid.UUID, item_id: str) -> Dict[str, Any]:
@@ -176,7 +175,7 @@ async def execute_get_item_details_by_id(db: AsyncSession, org_id: uuid.UUID, us
         item_uuid = uuid.UUID(item_id)
         item = await crud.item.get_item(db, item_id=item_uuid)
         if item and item.organization_id == org_id:
-            return {"status": "success", "data": make_model_dump_json_serializable(schemas.Item.model_validate(item).model_dump())}
+            return {"status": "success", "data": make_model_dump_json_serializable(schemas.ItemDetail.from_row(item).model_dump())}
         elif item: return {"status": "auth_error", "message": "Item does not belong to active organization."}
         return {"status": "not_found", "message": f"Item with ID '{item_id}' not found."}
     except ValueError: return {"status": "error", "message": "Invalid item_id format."}
@@ -191,8 +190,10 @@ async def execute_update_item_func(db: AsyncSession, org_id: uuid.UUID, user_id:
         
         update_data_in = {k: v for k, v in kwargs.items() if v is not None}
         item_update_schema = schemas.ItemUpdate(**update_data_in)
-        updated_item = await crud.item.update_item(db, db_obj=db_item, obj_in=item_update_schema)
-        return {"status": "success", "data": make_model_dump_json_serializable(schemas.Item.model_validate(updated_item).model_dump())}
+        try:
+            updated_item = await crud.item.update_item(db, db_obj=db_item, obj_in=item_update_schema)
+        except ValueError as e: return {"status": "error", "message": str(e)}
+        return {"status": "success", "data": make_model_dump_json_serializable(schemas.Item.from_row(updated_item).model_dump())}
     except ValueError: return {"status": "error", "message": "Invalid item_id format."}
     except Exception as e: traceback.print_exc(); return {"status": "error", "message": f"Failed to update item: {str(e)}"}
 
@@ -267,7 +268,9 @@ async def execute_get_invoices_for_user(db: AsyncSession, org_id: uuid.UUID, use
         limit=20 # Limit for AI context
     )
     if invoices:
-        summaries = [make_model_dump_json_serializable(schemas.InvoiceSummary.model_validate(inv).model_dump(context={"customer_repo": crud.customer, "db_session": db})) for inv in invoices] # Hack for customer name, improve later
+        # mode="json" gives the same UUID/date strings make_model_dump_json_serializable would
+        adapter = schemas.InvoiceSummaryListAdapter
+        summaries = adapter.dump_python(adapter.validate_python(invoices, from_attributes=True), mode="json")
         return {"status": "success", "count": len(summaries), "invoices": summaries}
     return {"status": "not_found", "message": "No invoices found matching criteria."}
 
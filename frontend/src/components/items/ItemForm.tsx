@@ -5,7 +5,7 @@ import { Input } from "@/components/ui/input";
 import { Label } from "@/components/ui/label";
 import { Textarea } from "@/components/ui/textarea";
 import apiClient from '@/services/apiClient';
-import { Item, ItemImage as ItemImageInterface } from '@/types'; // Renamed ItemImage to ItemImageInterface for clarity
+import { Item, ItemDetail, ItemImage as ItemImageInterface } from '@/types'; // Renamed ItemImage to ItemImageInterface for clarity
 import { getFullStaticUrl } from '@/config';
 import { useOrg } from '@/contexts/OrgContext';
 import { XCircleIcon, ImagePlusIcon, Trash2Icon } from "lucide-react"; // Use Trash2Icon for consistency
@@ -30,7 +30,7 @@ interface ItemFormData {
 
 interface ItemFormProps {
   mode: 'create' | 'edit';
-  initialData?: Item;
+  initialData?: ItemDetail;
   onSuccess: (processedItem: Item) => void;
   onCancel: () => void;
 }
@@ -171,7 +171,7 @@ const ItemForm = ({ mode, initialData, onSuccess, onCancel }: ItemFormProps) =>
           imageFormData.append('files', file);
         });
 
-        const imageUploadResponse = await apiClient.post<Item>(`/items/${savedItem.id}/images`, imageFormData, {
+        const imageUploadResponse = await apiClient.post<ItemDetail>(`/items/${savedItem.id}/images`, imageFormData, {
           headers: { 'Content-Type': 'multipart/form-data' },
         });
         savedItem = imageUploadResponse.data;
@@ -1,7 +1,7 @@
 // src/pages/ItemsPage.tsx
 import { useEffect, useState } from 'react';
 import apiClient from '@/services/apiClient';
-import { Item, ItemSummary } from '@/types'; // Item is for full item details for form
+import { Item, ItemDetail, ItemSummary } from '@/types'; // ItemDetail is for full item details for form
 import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardHeader, CardTitle, CardDescription } from "@/components/ui/card";
 import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from "@/components/ui/table";
@@ -24,7 +24,7 @@ const ItemsPage = () => {
   const [searchTerm, setSearchTerm] = useState("");
 
   const [isFormModalOpen, setIsFormModalOpen] = useState(false);
-  const [currentItem, setCurrentItem] = useState<Item | undefined>(undefined);
+  const [currentItem, setCurrentItem] = useState<ItemDetail | undefined>(undefined);
   const [formMode, setFormMode] = useState<'create' | 'edit'>('create');
 
   const [isDeleteDialogOpen, setIsDeleteDialogOpen] = useState(false);
@@ -83,7 +83,7 @@ const ItemsPage = () => {
   const handleOpenEditModal = async (itemId: string) => {
     setFormMode('edit');
     try {
-      const response = await apiClient.get<Item>(`/items/${itemId}`);
+      const response = await apiClient.get<ItemDetail>(`/items/${itemId}`);
       setCurrentItem(response.data);
       setIsFormModalOpen(true);
     } catch (err: any) {
@@ -103,6 +103,10 @@ export interface Item {
     description?: string | null;
     default_price?: number | null;
     default_unit?: string | null;
+}
+
+// GET /items/{id} (and the image upload response) also carry the item's images
+export interface ItemDetail extends Item {
     images: ItemImage[];
 }
 